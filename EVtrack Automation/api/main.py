@@ -1,21 +1,25 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request, Header, Depends, status
+from fastapi import FastAPI, HTTPException, WebSocket, Request, Header, Depends, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response, FileResponse, ORJSONResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from selenium.webdriver.common.by import By
-from utils.selenium_utils import start_driver
-from utils.lambda_selenium import start_driver_lambda, cleanup_temp_files
-from automation.login import EvTrackLogin
-from automation.visitors import VisitorAutomation
-from automation.vehicles import VehicleAutomation
-from automation.credentials import CredentialAutomation
-from automation.invitation import InvitationAutomation
-from automation.badges import BadgeAutomation
+from utils.lambda_selenium import IS_LAMBDA
+from utils.driver_pool import DriverPool, DriverPoolTimeout
+from utils.request_batcher import RequestBatcher
+from utils.ws_batcher import BatchedWSSender
 from models.visitor import VisitorData, VehicleData, CredentialData
+import asyncio
+import functools
+import hashlib
 import logging
 import os
-import time
 import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+import orjson
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -30,48 +34,28 @@ if not os.path.exists(env_file_path):
     print("Then edit .env with your EVTrack email and password\n")
 
 # Time validation function
-def validate_time_format(time_string):
+@functools.lru_cache(maxsize=1024)
+def _parse_time(time_string):
     """
-    Validate that time string is in HH:MM format with valid hours (00-23) and minutes (00-59)
-    Returns the validated time string or raises HTTPException if invalid
+    Check that time string is in HH:MM format with valid hours (00-23) and minutes (00-59)
+    Returns (True, cleaned time string) or (False, error message); callers decide how to report errors
+    Results are cached: form times come from a small set of values (1440 valid ones).
     """
     if not time_string or not time_string.strip():
-        return ""  # Empty is allowed
+        return True, ""  # Empty is allowed
     
     time_string = time_string.strip()
     
-    # Check exact format: HH:MM with exactly 5 characters
-    if len(time_string) != 5:
-        raise HTTPException(status_code=400, detail=f"Invalid time format '{time_string}'. Must be exactly HH:MM format (5 characters)")
-    
-    # Check regex pattern
-    pattern = r'^([01]?[0-9]|2[0-3]):[0-5][0-9]$'
-    if not re.match(pattern, time_string):
-        raise HTTPException(status_code=400, detail=f"Invalid time format '{time_string}'. Must be HH:MM format with valid hours (00-23) and minutes (00-59)")
+    # Check the fixed HH:MM shape character by character; a passing string is already canonical
+    if len(time_string) == 5 and time_string[2] == ':':
+        h0, h1, m0, m1 = time_string[0], time_string[1], time_string[3], time_string[4]
+        if ('0' <= h0 <= '1' and '0' <= h1 <= '9' or h0 == '2' and '0' <= h1 <= '3') \
+                and '0' <= m0 <= '5' and '0' <= m1 <= '9':
+            return True, time_string
     
-    # Additional validation to ensure colon is in correct position
-    if time_string[2] != ':':
-        raise HTTPException(status_code=400, detail=f"Invalid time format '{time_string}'. Colon must be in position 3 (HH:MM)")
-    
-    # Parse and validate hours and minutes
-    try:
-        hours, minutes = time_string.split(':')
-        hours_int = int(hours)
-        minutes_int = int(minutes)
-        
-        if hours_int < 0 or hours_int > 23:
-            raise HTTPException(status_code=400, detail=f"Invalid hours '{hours}'. Must be between 00 and 23")
-        
-        if minutes_int < 0 or minutes_int > 59:
-            raise HTTPException(status_code=400, detail=f"Invalid minutes '{minutes}'. Must be between 00 and 59")
-            
-        # Return validated time string with proper zero-padding
-        return f"{hours_int:02d}:{minutes_int:02d}"
-        
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=f"Invalid time format '{time_string}'. Hours and minutes must be numeric")
+    return False, f"Invalid time format '{time_string}'. Must be HH:MM format with valid hours (00-23) and minutes (00-59)"
 
-logging.basicConfig(level=logging.INFO)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -79,28 +63,48 @@ app = FastAPI(
     version="2.0.0",
     description="Enhanced EVTrack automation API with Cognito and Google OAuth authentication",
     docs_url=None,  # Disable default docs
-    redoc_url=None  # Disable default redoc
+    redoc_url=None,  # Disable default redoc
+    default_response_class=ORJSONResponse
 )
 
-# Add CORS middleware
+# Progress channel of the connected /ws client, if any. Set here rather than in a
+# startup hook because Mangum runs with lifespan off on Lambda
+app.state.active_websocket = None
+app.state.batched_sender = None
+app.state.driver_reaper = None
+
+# Add CORS middleware. CORS_ORIGINS is a comma-separated list of front-end origins;
+# when unset every origin is allowed, without credentials (the spec forbids
+# credentialed "*", and API keys / bearer tokens are headers, not cookies)
+CORS_ORIGINS = tuple(o.strip() for o in os.getenv("CORS_ORIGINS", "").split(",") if o.strip())
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # In production, specify your frontend domain
-    allow_credentials=True,
+    allow_origins=CORS_ORIGINS or ("*",),
+    allow_origin_regex=None,
+    allow_credentials=bool(CORS_ORIGINS),
     allow_methods=["*"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for a day
 )
 
 # Get credentials from environment variables
 EVTRACK_EMAIL = os.getenv("EVTRACK_EMAIL")
 EVTRACK_PASSWORD = os.getenv("EVTRACK_PASSWORD")
-VALID_API_KEYS = os.getenv("API_KEYS", "").split(",") if os.getenv("API_KEYS") else []
+# Hash-based lookup so every request's key check is O(1); blank entries are ignored
+VALID_API_KEYS = frozenset(k.strip() for k in os.getenv("API_KEYS", "").split(",") if k.strip())
+
+# Cognito settings are fixed for the life of the process, so read them once
+COGNITO_USER_POOL_ID = os.getenv('COGNITO_USER_POOL_ID')
+COGNITO_CLIENT_ID = os.getenv('COGNITO_CLIENT_ID')
+
+# Shared bearer scheme instance so the security dependency is built once, not per route
+_bearer_scheme = HTTPBearer(auto_error=False)
 
 # Simple authentication function that supports X-API-Key header and Bearer token
 async def verify_auth(
     request: Request,
     x_api_key: str = Header(None, alias="X-API-Key"),
-    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer(auto_error=False))
+    credentials: HTTPAuthorizationCredentials = Depends(_bearer_scheme)
 ):
     """Simple authentication supporting X-API-Key header and Bearer token"""
     
@@ -118,10 +122,7 @@ async def verify_auth(
         token = credentials.credentials
         
         # Try Cognito JWT first if configured
-        cognito_user_pool_id = os.getenv('COGNITO_USER_POOL_ID')
-        cognito_client_id = os.getenv('COGNITO_CLIENT_ID')
-        
-        if cognito_user_pool_id and cognito_client_id:
+        if COGNITO_USER_POOL_ID and COGNITO_CLIENT_ID:
             # TODO: Add proper Cognito JWT verification when auth module is available
             logger.info("Cognito configured but JWT verification not implemented yet")
             pass
@@ -140,9 +141,15 @@ async def verify_auth(
         detail="Authentication required. Use X-API-Key header or Authorization: Bearer <token>"
     )
 
+# One Depends instance shared by every protected route
+_auth_required = Depends(verify_auth)
+
 # Set headless mode for browser (False to see the browser)
 HEADLESS_MODE = os.environ.get('HEADLESS_MODE', 'False').lower() == 'true'
 
+# Environment is fixed at process start in both Lambda and container deployments
+GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
+
 def get_driver(headless=None):
     """
     Get the appropriate WebDriver based on environment
@@ -156,905 +163,459 @@ def get_driver(headless=None):
     if headless is None:
         headless = HEADLESS_MODE
     
-    # Check if we're in AWS Lambda
-    is_lambda = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
-    
-    if is_lambda:
+    # Selenium is imported here rather than at module load so routes that never
+    # touch a browser (docs, health) don't pay for it on a Lambda cold start
+    if IS_LAMBDA:
+        from utils.lambda_selenium import start_driver_lambda
         return start_driver_lambda(headless=True)  # Always headless in Lambda
     else:
+        from utils.selenium_utils import start_driver
         return start_driver(headless=headless)
 
-def validate_and_clean_time_fields(data_dict):
+# Warm drivers shared by the browser endpoints. Lambda containers serve one request
+# at a time, so they keep a single driver alive across invocations.
+DRIVER_POOL_SIZE = 1 if IS_LAMBDA else int(os.getenv("DRIVER_POOL_SIZE", "2"))
+# Requests queue for a free driver this long before failing instead of piling up
+DRIVER_WAIT_TIMEOUT = float(os.getenv("DRIVER_WAIT_TIMEOUT", "120"))
+# Idle drivers are quit after this many seconds (0 keeps them for the life of the worker)
+DRIVER_IDLE_TTL = float(os.getenv("DRIVER_IDLE_TTL", "600"))
+driver_pool = DriverPool(get_driver, DRIVER_POOL_SIZE, acquire_timeout=DRIVER_WAIT_TIMEOUT,
+                         idle_ttl=DRIVER_IDLE_TTL or None)
+# Seconds clients are told to wait before retrying when no browser frees up in time
+DRIVER_RETRY_AFTER = int(os.getenv("DRIVER_RETRY_AFTER", "30"))
+
+@app.exception_handler(DriverPoolTimeout)
+async def driver_pool_busy(request: Request, exc: DriverPoolTimeout):
+    """Answer requests that gave up waiting for a browser with 503, so clients can tell overload from failure"""
+    return ORJSONResponse(status_code=503, content={"detail": str(exc)},
+                          headers={"Retry-After": str(DRIVER_RETRY_AFTER)})
+
+# WebDriver calls block, so all browser work runs on this pool (one thread per pooled
+# driver) instead of the event loop, letting requests on other drivers proceed
+selenium_executor = ThreadPoolExecutor(max_workers=DRIVER_POOL_SIZE, thread_name_prefix="selenium")
+
+def _run_to_completion(fn, *args, **kwargs):
+    result = fn(*args, **kwargs)
+    # The automation classes expose async methods that block internally; give each its own loop
+    return asyncio.run(result) if asyncio.iscoroutine(result) else result
+
+async def run_selenium(fn, *args, **kwargs):
     """
-    Validate and clean all time fields in a data dictionary
-    Modifies the dictionary in place and returns it
-    """
-    time_fields = ['activateTime', 'expiryTime', 'active_time', 'expiry_time']
+    Run a blocking Selenium call (or an automation coroutine method) on the Selenium thread pool
     
-    for field in time_fields:
-        if field in data_dict:
-            try:
-                data_dict[field] = validate_time_format(data_dict[field])
-                logger.info(f"Validated time field {field}: '{data_dict[field]}'")
-            except HTTPException as e:
-                logger.error(f"Time validation failed for field {field}: {e.detail}")
-                raise e
-    
-    return data_dict
-
-@app.get("/docs", response_class=HTMLResponse)
-async def custom_swagger_ui():
-    """Custom Swagger UI with Uppy Dashboard file upload functionality that matches the HTML site exactly"""
-    return HTMLResponse(content="""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EvTrack Automation API - Swagger UI</title>
-    <link rel="stylesheet" type="text/css" href="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui.css" />
-    <!-- Uppy CSS for file uploads -->
-    <link href="https://releases.transloadit.com/uppy/v3.25.0/uppy.min.css" rel="stylesheet">
-    <style>
-        html {
-            box-sizing: border-box;
-            overflow: -moz-scrollbars-vertical;
-            overflow-y: scroll;
-        }
-        *, *:before, *:after {
-            box-sizing: inherit;
-        }
-        body {
-            margin:0;
-            background: #fafafa;
-            font-family: Inter, -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-        }
-        
-        /* Custom styling to match EvTrack theme */
-        .swagger-ui .topbar {
-            background-color: #1a1a1a;
-            border-bottom: 1px solid #333;
-        }
-        
-        .swagger-ui .topbar .download-url-wrapper {
-            display: none;
-        }
-        
-        .swagger-ui .info .title {
-            color: #2c5530;
-            font-size: 2.5rem;
-            font-weight: 700;
-        }
-        
-        .swagger-ui .info .description {
-            font-size: 1.1rem;
-            line-height: 1.6;
-            color: #333;
-        }
-        
-        /* Style operation blocks */
-        .swagger-ui .opblock {
-            border: 1px solid #e1e8ed;
-            border-radius: 8px;
-            margin-bottom: 16px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-        }
-        
-        .swagger-ui .opblock.opblock-get .opblock-summary {
-            background: rgba(76, 175, 80, 0.1);
-            border-color: #4CAF50;
-        }
-        
-        .swagger-ui .opblock.opblock-post .opblock-summary {
-            background: rgba(33, 150, 243, 0.1);
-            border-color: #2196F3;
-        }
-        
-        /* Hide examples that don't match our requirements */
-        .swagger-ui .model-example {
-            display: none;
-        }
-        
-        /* Clean up the request body examples */
-        .swagger-ui .models {
-            display: none;
-        }
-        
-        /* Custom header */
-        .custom-header {
-            background: linear-gradient(135deg, #2c5530 0%, #4a7c59 100%);
-            color: white;
-            padding: 20px;
-            text-align: center;
-            margin-bottom: 20px;
-        }
-        
-        .custom-header h1 {
-            margin: 0;
-            font-size: 2rem;
-            font-weight: 700;
-        }
-        
-        .custom-header p {
-            margin: 8px 0 0 0;
-            opacity: 0.9;
-            font-size: 1.1rem;
-        }
-
-        /* Enhanced file upload styling to match HTML site exactly */
-        .file-upload-container {
-            border: 2px dashed #d1d5db;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 10px 0;
-            background: #f9fafb;
-            position: relative;
-        }
-
-        .file-upload-container.drag-over {
-            border-color: #2196F3;
-            background: rgba(33, 150, 243, 0.05);
-        }
-
-        .uppy-dashboard-container {
-            min-height: 150px;
-            border-radius: 6px;
-        }
-
-        .file-upload-status {
-            display: none;
-            margin-top: 10px;
-            padding: 8px 12px;
-            border-radius: 4px;
-            font-size: 14px;
-        }
-
-        .file-upload-status.success {
-            display: block;
-            background: #d4edda;
-            color: #155724;
-            border: 1px solid #c3e6cb;
-        }
-
-        .file-upload-status.error {
-            display: block;
-            background: #f8d7da;
-            color: #721c24;
-            border: 1px solid #f5c6cb;
-        }
-
-        .uppy-Dashboard-dropFilesHereHint {
-            font-size: 16px !important;
-            color: #6b7280 !important;
-        }
-
-        .uppy-Dashboard-browse {
-            color: #2196F3 !important;
-            font-weight: 600 !important;
-        }
-
-        .uppy-DashboardTab-name {
-            font-size: 14px !important;
-            font-weight: 500 !important;
-        }
-
-        /* Custom file input styling for photo, signature, id_document */
-        .swagger-ui input[type="file"][name="photo"],
-        .swagger-ui input[type="file"][name="signature"], 
-        .swagger-ui input[type="file"][name="id_document"] {
-            display: none !important;
-        }
-
-        .swagger-ui .file[data-param-name="photo"] .file-upload-input,
-        .swagger-ui .file[data-param-name="signature"] .file-upload-input,
-        .swagger-ui .file[data-param-name="id_document"] .file-upload-input {
-            display: none !important;
-        }
-
-        /* Enhanced dropdown styling for country codes */
-        .swagger-ui select[name="country_code"],
-        .swagger-ui select[name="alt_country_code"] {
-            width: 100%;
-            padding: 8px 12px;
-            border: 1px solid #d1d5db;
-            border-radius: 6px;
-            background-color: white;
-            font-size: 14px;
-        }
-
-        .swagger-ui select[name="country_code"]:focus,
-        .swagger-ui select[name="alt_country_code"]:focus {
-            outline: none;
-            border-color: #2196F3;
-            box-shadow: 0 0 0 2px rgba(33, 150, 243, 0.1);
-        }
-
-        /* Phone input styling */
-        .swagger-ui input[name="mobile"],
-        .swagger-ui input[name="alt_number"] {
-            width: 100%;
-            padding: 8px 12px;
-            border: 1px solid #d1d5db;
-            border-radius: 6px;
-            font-size: 14px;
-        }
-
-        /* Orange highlighting for required vehicle fields in Add Vehicle action - Using multiple targeting methods */
-        .swagger-ui input[name="vin"].vehicle-required-field,
-        .swagger-ui input[name="number_plate"].vehicle-required-field {
-            border: 2px solid #ff6b35 !important;
-            background-color: rgba(255, 107, 53, 0.1) !important;
-            box-shadow: 0 0 0 1px rgba(255, 107, 53, 0.2) !important;
-        }
-
-        /* Green highlighting when field has valid content */
-        .swagger-ui input[name="vin"].vehicle-valid-field,
-        .swagger-ui input[name="number_plate"].vehicle-valid-field {
-            border: 2px solid #4CAF50 !important;
-            background-color: rgba(76, 175, 80, 0.1) !important;
-            box-shadow: 0 0 0 1px rgba(76, 175, 80, 0.2) !important;
-        }
-
-        /* Fallback CSS selectors for different swagger UI structures */
-        .swagger-ui .opblock input[name="vin"]:not(.vehicle-valid-field),
-        .swagger-ui .opblock input[name="number_plate"]:not(.vehicle-valid-field) {
-            border: 2px solid #ff6b35 !important;
-            background-color: rgba(255, 107, 53, 0.1) !important;
-            box-shadow: 0 0 0 1px rgba(255, 107, 53, 0.2) !important;
-        }
+    Returns:
+        Whatever fn returns, after awaiting it if it is a coroutine function
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(selenium_executor, functools.partial(_run_to_completion, fn, *args, **kwargs))
+
+async def _login_batch_driver(driver):
+    from automation.login import EvTrackLogin
+    login = EvTrackLogin(driver)
+    await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+
+# A single batched create (or the batch's login) that runs longer than this fails and
+# its driver is quit, rather than stalling the operations queued behind it
+BATCH_OPERATION_TIMEOUT = float(os.getenv("BATCH_OPERATION_TIMEOUT", "300"))
+
+# Visitor and credential creates that arrive within the same 50ms window share
+# one login and one driver checkout
+ingest_batcher = RequestBatcher(driver_pool, _login_batch_driver, max_batch=16, max_wait_ms=50,
+                                operation_timeout=BATCH_OPERATION_TIMEOUT or None)
+
+async def _reap_idle_drivers():
+    while True:
+        await asyncio.sleep(60)
+        try:
+            await driver_pool.reap_idle()
+        except Exception as e:
+            logger.error(f"Failed to reap idle drivers: {str(e)}")
+
+@app.on_event("startup")
+async def startup_driver_pool():
+    # Log the warm drivers in too, so the first requests reuse an EVTrack session
+    await driver_pool.prewarm(setup=_login_batch_driver if EVTRACK_EMAIL and EVTRACK_PASSWORD else None)
+    if driver_pool.idle_ttl:
+        app.state.driver_reaper = asyncio.create_task(_reap_idle_drivers())
+
+@app.on_event("shutdown")
+async def shutdown_driver_pool():
+    if app.state.driver_reaper is not None:
+        app.state.driver_reaper.cancel()
+    driver_pool.close()
+
+# Time field names across the visitor/invitation and credential payloads
+_TIME_FIELDS = frozenset({'activateTime', 'expiryTime', 'active_time', 'expiry_time'})
+
+# Visitor form fields that carry file uploads or checkbox values
+FILE_FIELDS = frozenset({'photo', 'signature', 'id_document'})
+CHECKBOX_FIELDS = frozenset({'first_nations', 'disability'})
+
+# Form fields copied onto the visitor by /visitors/update (form names match visitor attributes)
+VISITOR_UPDATE_FIELDS = (
+    'initials', 'first_name', 'last_name', 'id_number', 'company', 'mobile', 'email',
+    'address', 'nationality', 'comments', 'reason_for_visit', 'first_nations', 'disability',
+    'date_of_birth', 'country_of_issue', 'alt_number', 'gender'
+)
 
-        /* Orange star indicator for required vehicle fields */
-        .vehicle-required-indicator {
-            color: #ff6b35 !important;
-            font-weight: bold !important;
-            margin-left: 4px !important;
-            font-size: 16px !important;
-        }
+# Every form field update_visitor reads: the visitor fields plus checkbox change flags and country codes
+VISITOR_UPDATE_FORM_KEYS = VISITOR_UPDATE_FIELDS + (
+    'first_nations_change', 'disability_change', 'country_code', 'alt_country_code'
+)
 
-        /* Simple CSS to add orange star to VIN and Number Plate labels in Add Vehicle */
-        .swagger-ui .opblock .parameter__name:after {
-            content: "";
-        }
-        
-        .swagger-ui .opblock .parameter__name[data-name="vin"]:after,
-        .swagger-ui .opblock .parameter__name[data-name="number_plate"]:after {
-            content: " ";
-            color: #ff6b35;
-            font-weight: bold;
-            margin-left: 4px;
-        }
+# Form fields accepted by the vehicle add/update endpoints
+VEHICLE_FIELDS = (
+    'number_plate', 'vehicle_type', 'make', 'model', 'year',
+    'colour', 'vin', 'engine_number', 'licence_disc_number',
+    'licence_expiry_date', 'document_number', 'comments'
+)
 
-        /* Additional CSS targeting for table-based layouts */
-        .swagger-ui table tr td:first-child:has(+ td input[name="vin"]):after,
-        .swagger-ui table tr td:first-child:has(+ td input[name="number_plate"]):after {
-            content: " ";
-            color: #ff6b35;
-            font-weight: bold;
-            margin-left: 4px;
-        }
+# Credential form fields accepted by the add/update endpoints (times are validated separately)
+CREDENTIAL_ADD_FIELDS = (
+    'reader_type', 'unique_identifier', 'pin', 'active_date',
+    'expiry_date', 'use_limit', 'comments', 'status'
+)
+CREDENTIAL_UPDATE_FIELDS = ('active_date', 'expiry_date', 'use_limit', 'comments', 'status')
 
-        /* Force orange highlighting on VIN and Number Plate inputs in Add Vehicle */
-        .swagger-ui input[name="vin"],
-        .swagger-ui input[name="number_plate"] {
-            border: 2px solid #ff6b35 !important;
-            background-color: rgba(255, 107, 53, 0.1) !important;
-            box-shadow: 0 0 0 1px rgba(255, 107, 53, 0.2) !important;
-        }
-    </style>
-</head>
-<body>
-    <div class="custom-header">
-        <h1>EvTrack Automation API</h1>
-        <p>Swagger UI for EvTrack Automation</p>
-    </div>
-    <div id="swagger-ui"></div>
-    <script src="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui-bundle.js"></script>
-    <script src="https://unpkg.com/swagger-ui-dist@5.9.0/swagger-ui-standalone-preset.js"></script>
-    <!-- Uppy JavaScript for file uploads -->
-    <script src="https://releases.transloadit.com/uppy/v3.25.0/uppy.min.js"></script>
-    <script>
-        // Global variables for Uppy instances
-        window.uppyInstances = {};
-        
-        function initializeUppyForFileInput(fileParam, container) {
-            const fieldName = fileParam.getAttribute('data-param-name');
-            if (!fieldName || window.uppyInstances[fieldName]) return;
-
-            console.log('Initializing Uppy for field:', fieldName);
-
-            // Create Uppy container
-            const uppyContainer = document.createElement('div');
-            uppyContainer.id = `uppy-${fieldName}`;
-            uppyContainer.className = 'uppy-dashboard-container';
-            
-            // Create file upload container wrapper
-            const uploadContainer = document.createElement('div');
-            uploadContainer.className = 'file-upload-container';
-            uploadContainer.appendChild(uppyContainer);
-            
-            // Create status message div
-            const statusDiv = document.createElement('div');
-            statusDiv.className = 'file-upload-status';
-            statusDiv.id = `upload-status-${fieldName}`;
-            uploadContainer.appendChild(statusDiv);
-
-            // Replace the file input with our Uppy container
-            fileParam.style.display = 'none';
-            fileParam.parentNode.insertBefore(uploadContainer, fileParam.nextSibling);
-
-            // Determine accepted file types based on field name
-            let acceptedTypes = ['image/*'];
-            if (fieldName === 'id_document') {
-                acceptedTypes = ['image/*', 'application/pdf'];
-            }
+# Google Sheets column names and the visitor fields they map to
+SHEETS_TO_EVTRACK_FIELDS = (
+    ('firstName', 'first_name'), ('lastName', 'last_name'), ('email', 'email'), ('mobile', 'mobile'),
+    ('company', 'company'), ('reasonForVisit', 'reason_for_visit'), ('comments', 'comments')
+)
 
-            // Initialize Uppy with Dashboard
-            const uppy = new Uppy.Uppy({
-                id: fieldName,
-                autoProceed: false,
-                allowMultipleUploads: false,
-                restrictions: {
-                    maxNumberOfFiles: 1,
-                    allowedFileTypes: acceptedTypes,
-                    maxFileSize: 10 * 1024 * 1024 // 10MB
-                },
-                meta: {
-                    fieldName: fieldName
-                }
-            });
-
-            uppy.use(Uppy.Dashboard, {
-                target: `#uppy-${fieldName}`,
-                inline: true,
-                width: '100%',
-                height: 150,
-                hideUploadButton: true,
-                hideRetryButton: true,
-                hidePauseResumeButton: true,
-                hideCancelButton: false,
-                showProgressDetails: true,
-                note: fieldName === 'photo' ? 'Images only, up to 10MB' :
-                      fieldName === 'signature' ? 'Images only, up to 10MB' :
-                      fieldName === 'id_document' ? 'Images and PDFs, up to 10MB' : 'Up to 10MB',
-                proudlyDisplayPoweredByUppy: false,
-                locale: {
-                    strings: {
-                        dropHereOr: 'Drop files here, %{browse} or import from:',
-                        browse: 'browse files'
-                    }
-                }
-            });
-
-            uppy.use(Uppy.Webcam, {
-                target: Uppy.Dashboard,
-                modes: ['picture'],
-                mirror: false,
-                showVideoSourceDropdown: true,
-                showRecordingLength: false
-            });
-
-            // Handle file addition
-            uppy.on('file-added', (file) => {
-                console.log('File added to Uppy:', file.name, 'for field:', fieldName);
-                
-                // Convert file to format expected by original file input
-                const dt = new DataTransfer();
-                
-                // Create a File object from Uppy file data
-                file.data.arrayBuffer().then(buffer => {
-                    const fileBlob = new File([buffer], file.name, { type: file.type });
-                    dt.items.add(fileBlob);
-                    
-                    // Set to original file input for form submission
-                    fileParam.files = dt.files;
-                    
-                    console.log('File set to original input for:', fieldName);
-                    
-                    // Show success status
-                    statusDiv.className = 'file-upload-status success';
-                    statusDiv.textContent = `File ${file.name} ready for upload`;
-                }).catch(err => {
-                    console.error('Error processing file:', err);
-                    statusDiv.className = 'file-upload-status error';
-                    statusDiv.textContent = ` Error processing ${file.name}`;
-                });
-            });
-
-            // Handle file removal
-            uppy.on('file-removed', (file) => {
-                console.log('File removed from Uppy:', file.name, 'for field:', fieldName);
-                
-                // Clear the original file input
-                fileParam.value = '';
-                
-                // Hide status
-                statusDiv.className = 'file-upload-status';
-                statusDiv.textContent = '';
-            });
-
-            // Handle errors
-            uppy.on('restriction-failed', (file, error) => {
-                console.error('Uppy restriction failed:', error);
-                statusDiv.className = 'file-upload-status error';
-                statusDiv.textContent = ` ${error.message}`;
-            });
-
-            // Store the Uppy instance
-            window.uppyInstances[fieldName] = uppy;
-            
-            console.log('Uppy initialized successfully for:', fieldName);
-        }
+# Form fields converted to int; values that don't parse are dropped
+INT_FORM_FIELDS = frozenset({'year', 'use_limit'})
+
+# Invitation dropdown display names mapped to their EVTrack IDs
+LOCATION_IDS = MappingProxyType({
+    "Select Location...": "",
+    "Inherited - Default Visitor Access List": "0",
+    "IO Main Campus": "2715"
+})
+VISIT_REASON_IDS = MappingProxyType({
+    "None": "0",
+    "Visitor": "642",
+    "Delivery": "643",
+    "Guest House Visitor": "645",
+    "Parent Pickup/Dropoff": "647",
+    "Staff": "648",
+    "Tour": "646"
+})
+
+# Vehicle, credential and invite forms are a few dozen text fields at most; capping the
+# parser stops an oversized or file-laden body from being decoded at all
+TEXT_FORM_MAX_FIELDS = 64
+
+# Upper bound on the rows / search terms one bulk request may ask for, so a single
+# call can't hold pooled drivers for hours
+MAX_BULK_ROWS = int(os.getenv("MAX_BULK_ROWS", "500"))
+
+# Chunk size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Phone number fields and the country code dropdown that goes with each
+PHONE_FIELDS = (('mobile', 'country_code'), ('alt_number', 'alt_country_code'))
+
+def normalize_phone(country_code, number):
+    """
+    Prefix a phone number with the code from a country dropdown value (e.g. "United States +1")
+    Numbers that already start with '+' are kept as they are. Returns None when there is no number.
+    """
+    number = str(number or '').strip()
+    if not number:
+        return None
+    if number.startswith('+'):
+        return number
+    code = COUNTRY_TO_CODE.get(country_code)
+    if code is None:
+        # Labels outside the documented dropdown still carry their code after the last ' +'
+        _, sep, code = str(country_code or '').rpartition(' +')
+        code = code if sep else ''
+    return f"+{code} {number}" if code else number
+
+def _spool_upload(upload):
+    """Copy an upload to a named temp file in fixed-size chunks, returning (path, size)"""
+    suffix = os.path.splitext(upload.filename)[1] or '.tmp'
+    upload.file.seek(0)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+        shutil.copyfileobj(upload.file, temp_file, UPLOAD_CHUNK_SIZE)
+        return temp_file.name, temp_file.tell()
+
+async def read_json(request):
+    """Parse a JSON request body with orjson, which is much faster than json on large sheet payloads"""
+    return orjson.loads(await request.body())
+
+async def read_request_fields(request):
+    """
+    Parse a JSON or form request body, picking the parser from the Content-Type
+    Returns a mapping of the body's fields (empty when there is no usable body).
+    """
+    content_type = request.headers.get('content-type', '')
+    try:
+        if content_type.startswith('application/json'):
+            data = await read_json(request)
+            return data if isinstance(data, dict) else {}
+        if content_type.startswith(('multipart/form-data', 'application/x-www-form-urlencoded')):
+            return await request.form()
+    except Exception as e:
+        logger.info(f"Could not parse request body: {str(e)}")
+    return {}
 
-        function hideFileInput(fieldName) {
-            const interval = setInterval(() => {
-                const fileInput = document.querySelector(`input[type="file"][name="${fieldName}"]`);
-                if (fileInput) {
-                    fileInput.style.display = 'none';
-                    fileInput.style.visibility = 'hidden';
-                    const wrapper = fileInput.closest('.file');
-                    if (wrapper) {
-                        wrapper.style.display = 'none';
-                    }
-                    clearInterval(interval);
-                }
-            }, 100);
-        }
+def clean_form_fields(form_data, keys):
+    """
+    Read each of `keys` from a form once, returning {key: stripped value} for the non-empty ones
+    Uploads and missing fields are skipped.
+    """
+    cleaned = {}
+    for key in keys:
+        value = form_data.get(key)
+        if isinstance(value, str) and (value := value.strip()):
+            cleaned[key] = value
+    return cleaned
+
+def parse_form_fields(form_data, keys):
+    """
+    Read `keys` from a form in one pass: non-empty values are stripped and
+    INT_FORM_FIELDS are converted to int (dropped when they aren't numbers)
+    """
+    parsed = clean_form_fields(form_data, keys)
+    for key in INT_FORM_FIELDS.intersection(parsed):
+        value = parsed[key]
+        # Check the digits up front rather than paying for a ValueError on bad input
+        digits = value[1:] if value[0] in '+-' else value
+        if digits.isascii() and digits.isdigit():
+            parsed[key] = int(value)
+        else:
+            del parsed[key]
+    logger.debug("Parsed form fields: %s", parsed)
+    return parsed
 
-        function hideAllFileInputs() {
-            hideFileInput('photo');
-            hideFileInput('signature');
-            hideFileInput('id_document');
-        }
+async def spool_form_uploads(form_data):
+    """
+    Stream every non-empty photo/signature/id_document upload in a form to disk
+    Returns a list of (field name, UploadFile, temp file path, size) tuples
+    
+    Selenium only needs a path to hand to the file input, so the uploads are never
+    read into memory as a whole. The caller owns the temp files and must remove them
+    with remove_spooled_uploads() once the automation is done.
+    """
+    uploads = [
+        (key, value) for key, value in form_data.items()
+        if key in FILE_FIELDS and getattr(value, 'filename', None) and value.filename.strip()
+    ]
+    spooled = await asyncio.gather(*(asyncio.to_thread(_spool_upload, value) for _, value in uploads))
+    
+    results = []
+    for (key, value), (path, size) in zip(uploads, spooled):
+        if size:
+            results.append((key, value, path, size))
+        else:
+            logger.warning(f"{key} field has filename but no file data")
+            os.unlink(path)
+    return results
 
-        function setupCountryCodeDropdowns() {
-            const mobileCountryCode = document.querySelector('select[name="country_code"]');
-            const altCountryCode = document.querySelector('select[name="alt_country_code"]');
-            const mobileInput = document.querySelector('input[name="mobile"]');
-            const altNumberInput = document.querySelector('input[name="alt_number"]');
-            
-            if (mobileCountryCode && mobileInput) {
-                mobileCountryCode.addEventListener('change', function() {
-                    const selectedValue = this.value;
-                    const countryCode = selectedValue.split(' +')[1];
-                    
-                    if (countryCode) {
-                        // Update the mobile input with the country code
-                        const currentNumber = mobileInput.value.replace(/^\\+?\\d+\\s?/, ''); // Remove existing country code
-                        mobileInput.value = `+${countryCode} ${currentNumber}`.trim();
-                        mobileInput.placeholder = `+${countryCode} 123456789`;
-                        
-                        console.log('Mobile country code selected:', selectedValue, 'Code:', countryCode);
-                    }
-                });
-                
-                // Set initial placeholder
-                mobileInput.placeholder = 'Select country code first';
-            }
-            
-            if (altCountryCode && altNumberInput) {
-                altCountryCode.addEventListener('change', function() {
-                    const selectedValue = this.value;
-                    const countryCode = selectedValue.split(' +')[1];
-                    
-                    if (countryCode) {
-                        // Update the alt number input with the country code
-                        const currentNumber = altNumberInput.value.replace(/^\\+?\\d+\\s?/, ''); // Remove existing country code
-                        altNumberInput.value = `+${countryCode} ${currentNumber}`.trim();
-                        altNumberInput.placeholder = `+${countryCode} 123456789`;
-                        
-                        console.log('Alt country code selected:', selectedValue, 'Code:', countryCode);
-                    }
-                });
-                
-                // Set initial placeholder
-                altNumberInput.placeholder = 'Select country code first';
-            }
-            
-            // Add validation to ensure country code is selected before allowing phone input
-            if (mobileInput) {
-                mobileInput.addEventListener('focus', function() {
-                    if (!mobileCountryCode || !mobileCountryCode.value) {
-                        alert('Please select a country code first');
-                        if (mobileCountryCode) mobileCountryCode.focus();
-                    }
-                });
-            }
-            
-            if (altNumberInput) {
-                altNumberInput.addEventListener('focus', function() {
-                    if (!altCountryCode || !altCountryCode.value) {
-                        alert('Please select a country code first for the alternate number');
-                        if (altCountryCode) altCountryCode.focus();
-                    }
-                });
-            }
-        }
+def remove_spooled_uploads(paths):
+    """Delete temp files created by spool_form_uploads(), ignoring ones already gone"""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
-        function setupVehicleFieldHighlighting() {
-            // Function to add orange star to VIN and Number Plate labels in Add Vehicle operation
-            function addStarsToVehicleFields() {
-                // Look for labels and spans that contain VIN or number_plate text
-                const allElements = document.querySelectorAll('label, span, div, td, th');
-                
-                allElements.forEach(element => {
-                    const text = element.textContent.toLowerCase().trim();
-                    
-                    // Check if this is a VIN field label and we haven't added a star yet
-                    if (text === 'vin' && !element.innerHTML.includes('')) {
-                        element.innerHTML = element.innerHTML + ' <span style="color: #ff6b35; font-weight: bold; margin-left: 4px;"></span>';
-                        console.log('Added star to VIN field');
-                    }
-                    
-                    // Check if this is a Number Plate field label and we haven't added a star yet
-                    if ((text === 'number_plate' || text === 'numberplate') && !element.innerHTML.includes('')) {
-                        element.innerHTML = element.innerHTML + ' <span style="color: #ff6b35; font-weight: bold; margin-left: 4px;"></span>';
-                        console.log('Added star to Number Plate field');
-                    }
-                });
-                
-                // Also try to find input fields directly and add stars to their labels
-                const vinInput = document.querySelector('input[name="vin"]');
-                const plateInput = document.querySelector('input[name="number_plate"]');
-                
-                if (vinInput) {
-                    const vinLabel = vinInput.closest('tr')?.querySelector('td:first-child') || 
-                                    vinInput.parentElement?.querySelector('label') ||
-                                    vinInput.previousElementSibling;
-                    if (vinLabel && !vinLabel.innerHTML.includes('')) {
-                        vinLabel.innerHTML = vinLabel.innerHTML + ' <span style="color: #ff6b35; font-weight: bold; margin-left: 4px;"></span>';
-                        console.log('Added star to VIN input label');
-                    }
-                }
-                
-                if (plateInput) {
-                    const plateLabel = plateInput.closest('tr')?.querySelector('td:first-child') || 
-                                      plateInput.parentElement?.querySelector('label') ||
-                                      plateInput.previousElementSibling;
-                    if (plateLabel && !plateLabel.innerHTML.includes('')) {
-                        plateLabel.innerHTML = plateLabel.innerHTML + ' <span style="color: #ff6b35; font-weight: bold; margin-left: 4px;"></span>';
-                        console.log('Added star to Number Plate input label');
-                    }
-                }
-            }
-            
-            // Run multiple times to catch all cases as Swagger UI loads dynamically
-            setTimeout(addStarsToVehicleFields, 500);
-            setTimeout(addStarsToVehicleFields, 1000);
-            setTimeout(addStarsToVehicleFields, 2000);
-            setTimeout(addStarsToVehicleFields, 3000);
-            setTimeout(addStarsToVehicleFields, 5000);
-        }
+def validate_and_clean_time_fields(data_dict):
+    """
+    Validate and clean all time fields in a data dictionary
+    Modifies the dictionary in place and returns it. Every invalid field is
+    reported in a single HTTPException so clients can fix them in one go.
+    """
+    errors = []
+    for field in _TIME_FIELDS.intersection(data_dict):
+        ok, result = _parse_time(data_dict[field])
+        if ok:
+            data_dict[field] = result
+            logger.debug(f"Validated time field {field}: '{result}'")
+        else:
+            logger.error(f"Time validation failed for field {field}: {result}")
+            errors.append({"field": field, "error": result})
+    
+    if errors:
+        raise HTTPException(status_code=400, detail={"time_errors": errors})
+    
+    return data_dict
 
+# Swagger UI page shipped as a static file; FileResponse streams it from the OS page cache
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+SWAGGER_HTML_PATH = os.path.join(STATIC_DIR, "swagger.html")
+with open(SWAGGER_HTML_PATH, "rb") as f:
+    _SWAGGER_ETAG = f'"{hashlib.sha1(f.read()).hexdigest()}"'
 
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-        window.onload = function() {
-            const ui = SwaggerUIBundle({
-                url: '/docs/openapi.yaml',
-                dom_id: '#swagger-ui',
-                deepLinking: true,
-                presets: [
-                    SwaggerUIBundle.presets.apis,
-                    SwaggerUIStandalonePreset
-                ],
-                plugins: [
-                    SwaggerUIBundle.plugins.DownloadUrl
-                ],
-                layout: "StandaloneLayout",
-                defaultModelsExpandDepth: -1,
-                defaultModelExpandDepth: 1,
-                docExpansion: "list",
-                filter: false,
-                showExtensions: false,
-                showCommonExtensions: false,
-                tryItOutEnabled: true,
-                requestInterceptor: function(request) {
-                    // Ensure all text fields start empty by removing example values
-                    if (request.body && typeof request.body === 'string') {
-                        try {
-                            const bodyObj = JSON.parse(request.body);
-                            // Clear any "string" default values but keep actual user input
-                            for (const key in bodyObj) {
-                                if (bodyObj[key] === "string" || bodyObj[key] === "example") {
-                                    delete bodyObj[key];
-                                }
-                            }
-                            request.body = JSON.stringify(bodyObj);
-                        } catch (e) {
-                            // If not JSON, leave as is
-                        }
-                    }
+@app.get("/docs", response_class=HTMLResponse)
+async def custom_swagger_ui(request: Request):
+    """Custom Swagger UI with Uppy Dashboard file upload functionality that matches the HTML site exactly"""
+    # Short max-age, but revalidation is cheap: an unchanged page answers with a bodiless 304
+    headers = {"Cache-Control": "public, max-age=300", "ETag": _SWAGGER_ETAG}
+    if request.headers.get("if-none-match") == _SWAGGER_ETAG:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(SWAGGER_HTML_PATH, media_type="text/html", headers=headers)
 
-                    return request;
-                },
-                onComplete: function() {
-                    // Custom JavaScript to ensure proper form behavior including Uppy setup and phone inputs
-                    setTimeout(function() {
-                        // Clear all default text values in input fields
-                        const inputs = document.querySelectorAll('input[type="text"], input[type="date"], input[type="email"]');
-                        inputs.forEach(function(input) {
-                            if (input.value === 'string' || input.value === 'example' || input.placeholder === 'string') {
-                                input.value = '';
-                                input.placeholder = '';
-                            }
-                        });
-                        
-                        // Ensure location field is required and properly highlighted
-                        const locationSelect = document.querySelector('select[name="locationId"]');
-                        if (locationSelect) {
-                            locationSelect.setAttribute('required', 'true');
-                            const parentDiv = locationSelect.closest('div');
-                            if (parentDiv) {
-                                const label = parentDiv.querySelector('label') || parentDiv.previousElementSibling;
-                                if (label && !label.innerHTML.includes('*')) {
-                                    label.innerHTML += ' <span style="color: red;">*</span>';
-                                }
-                            }
-                        }
-
-                        // Setup country code dropdowns
-                        setupCountryCodeDropdowns();
-
-                        // Setup vehicle field indicators for Add Vehicle action
-                        setupVehicleFieldHighlighting();
-
-
-
-                        // Initialize Uppy for file upload fields
-                        const fileInputs = document.querySelectorAll('input[type="file"][name="photo"], input[type="file"][name="signature"], input[type="file"][name="id_document"]');
-                        fileInputs.forEach(fileInput => {
-                            const container = fileInput.closest('.swagger-ui');
-                            if (container) {
-                                initializeUppyForFileInput(fileInput, container);
-                            }
-                        });
-
-                        // Set up observer for dynamically added elements
-                        const observer = new MutationObserver(function(mutations) {
-                            mutations.forEach(function(mutation) {
-                                if (mutation.type === 'childList') {
-                                    // Check for new file inputs
-                                    const newFileInputs = mutation.target.querySelectorAll ? 
-                                        mutation.target.querySelectorAll('input[type="file"][name="photo"], input[type="file"][name="signature"], input[type="file"][name="id_document"]') : [];
-                                    
-                                    newFileInputs.forEach(fileInput => {
-                                        if (!fileInput.dataset.uppyInitialized) {
-                                            fileInput.dataset.uppyInitialized = 'true';
-                                            const container = fileInput.closest('.swagger-ui');
-                                            if (container) {
-                                                setTimeout(() => initializeUppyForFileInput(fileInput, container), 100);
-                                            }
-                                        }
-                                    });
-
-                                    // Check for new country code dropdowns
-                                    const newCountrySelects = mutation.target.querySelectorAll ? 
-                                        mutation.target.querySelectorAll('select[name="country_code"], select[name="alt_country_code"]') : [];
-                                    
-                                    if (newCountrySelects.length > 0) {
-                                        setupCountryCodeDropdowns();
-                                    }
-
-                                    // Check for new vehicle input fields
-                                    const newVehicleInputs = mutation.target.querySelectorAll ? 
-                                        mutation.target.querySelectorAll('input[name="vin"], input[name="number_plate"]') : [];
-                                    
-                                    if (newVehicleInputs.length > 0) {
-                                        setupVehicleFieldHighlighting();
-                                    }
-                                }
-                            });
-                        });
-
-                        observer.observe(document.body, {
-                            childList: true,
-                            subtree: true
-                        });
-                        
-                    }, 1500); // Increased delay to ensure Swagger UI is fully loaded
-                }
-            });
-        };
-    </script>
-</body>
-</html>
-    """)
 
+# Bodyless and stateless, so one instance serves every favicon request
+_FAVICON_RESPONSE = Response(status_code=204)
 
-@app.get("/favicon.ico")
+@app.get("/favicon.ico", include_in_schema=False)
 async def favicon():
     """Handle favicon requests to prevent 404 errors"""
-    return HTMLResponse(content="", status_code=204)
+    return _FAVICON_RESPONSE
+
+# The spec only changes on deploy, so read it and compute its ETag once at import
+try:
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "openapi.yaml"), "rb") as f:
+        _OPENAPI_YAML = f.read()
+    _OPENAPI_ETAG = f'"{hashlib.sha1(_OPENAPI_YAML).hexdigest()}"'
+except FileNotFoundError:
+    _OPENAPI_YAML = None
+    _OPENAPI_ETAG = None
+
+# Country dropdown labels from the spec's enums (e.g. "United States +1"), mapped to their dialing code
+COUNTRY_TO_CODE = {
+    m.group(1).decode(): m.group(2).decode()
+    for m in re.finditer(rb'^\s*- "(.+ \+(\d+))"\s*$', _OPENAPI_YAML or b'', re.MULTILINE)
+}
 
 @app.get("/docs/openapi.yaml", response_class=HTMLResponse)
-async def get_openapi_yaml():
+async def get_openapi_yaml(request: Request):
     """Serve the OpenAPI spec in YAML format"""
-    try:
-        with open("api/openapi.yaml", "r") as f:
-            yaml_content = f.read()
-        return HTMLResponse(content=yaml_content, media_type="text/yaml")
-    except FileNotFoundError:
+    if _OPENAPI_YAML is None:
         raise HTTPException(status_code=404, detail="OpenAPI spec not found")
+    headers = {"Cache-Control": "public, max-age=3600", "ETag": _OPENAPI_ETAG}
+    if request.headers.get("if-none-match") == _OPENAPI_ETAG:
+        return Response(status_code=304, headers=headers)
+    return Response(content=_OPENAPI_YAML, media_type="text/yaml", headers=headers)
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
+    # Store the websocket connection in the app state. Automation progress goes
+    # through the batched sender, which sends updates as JSON array frames
+    sender = BatchedWSSender(websocket)
+    app.state.active_websocket = websocket
+    app.state.batched_sender = sender
     try:
-        # Store the websocket connection in the app state
-        app.state.active_websocket = websocket
-        
-        while True:
-            # Keep the connection alive and wait for progress updates
-            data = await websocket.receive_text()
-    except WebSocketDisconnect:
-        # Clear the websocket when disconnected
-        app.state.active_websocket = None
-
-@app.get("/visitors")
-async def get_visitors(search: str = None, auth_data: dict = Depends(verify_auth)):
-    driver = None
+        # The channel is write-only; raw receive() only waits for the disconnect
+        # without decoding anything the client might send
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+    finally:
+        sender.close()
+        # Clear the websocket when disconnected, unless a newer client has taken over
+        if app.state.batched_sender is sender:
+            app.state.active_websocket = None
+            app.state.batched_sender = None
+
+@app.get("/visitors", responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}})
+async def get_visitors(search: str = None, auth_data: dict = _auth_required):
     try:
         # Check if credentials are available
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials. Please check your .env file.")
             
-        driver = get_driver()
-        login = EvTrackLogin(driver)
-        
-        # First ensure we're logged in
-        try:
-            logger.info("Attempting to log in...")
-            await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-            logger.info("Login successful")
-        except Exception as login_error:
-            logger.error(f"Login failed: {str(login_error)}")
-            raise HTTPException(status_code=401, detail=f"Login failed: {str(login_error)}")
-        
-        # Initialize visitor automation with websocket if available
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        # Get visitor summary
-        logger.info("Getting visitor summary...")
-        visitors = await visitor_automation.get_visitor_summary(search)
-        
-        # The get_visitor_summary already returns complete details, so just return them
-        logger.info(f"Retrieved {len(visitors)} visitors with complete details")
-        return {"visitors": visitors}
-        
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            
+            # First ensure we're logged in
+            try:
+                logger.info("Attempting to log in...")
+                await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+                logger.info("Login successful")
+            except Exception as login_error:
+                logger.error(f"Login failed: {str(login_error)}")
+                raise HTTPException(status_code=401, detail=f"Login failed: {str(login_error)}")
+            
+            # Initialize visitor automation with websocket if available
+            from automation.visitors import VisitorAutomation
+            visitor_automation = VisitorAutomation(driver, websocket=app.state.batched_sender)
+            
+            # Get visitor summary
+            logger.info("Getting visitor summary...")
+            visitors = await run_selenium(visitor_automation.get_visitor_summary, search)
+            
+            # The get_visitor_summary already returns complete details, so just return them
+            logger.info(f"Retrieved {len(visitors)} visitors with complete details")
+            return {"visitors": visitors}
+            
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Failed to search visitors: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
-@app.post("/visitors")
-async def create_visitor(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+@app.post("/visitors", responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}})
+async def create_visitor(request: Request, auth_data: dict = _auth_required):
+    upload_paths = []
     try:
         # Get form data from request
         form_data = await request.form()
-        visitor_data = {}
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Form data keys: {list(form_data.keys())}")
         
-        logger.info(f"Form data keys: {list(form_data.keys())}")
+        # Convert form data to dictionary in one pass; checkboxes are normalized to 'true'/'false'
+        visitor_data = {
+            key: ('true' if value == 'true' else 'false') if key in CHECKBOX_FIELDS else value
+            for key, value in form_data.items() if key not in FILE_FIELDS
+        }
         
-        # Convert form data to dictionary, handling file uploads with enhanced Uppy support
-        for key, value in form_data.items():
-            logger.info(f"Processing form field: {key} = {type(value)} - {getattr(value, 'filename', 'N/A')}")
-            
-            if key in ['photo', 'signature', 'id_document']:
-                # Handle file uploads from both standard form uploads and Uppy Dashboard
-                if hasattr(value, 'file') and value.filename and value.filename.strip():
-                    file_data = await value.read()
-                    
-                    # Only process if we actually have file data
-                    if file_data and len(file_data) > 0:
-                        upload_key = f'{key}_upload'
-                        visitor_data[upload_key] = {
-                            'filename': value.filename,
-                            'content_type': value.content_type or 'application/octet-stream',
-                            'file_data': file_data
-                        }
-                        logger.info(f"Created {upload_key} with {len(file_data)} bytes for {value.filename}")
-                    else:
-                        logger.warning(f"{key} field has filename but no file data")
-                
-                else:
-                    logger.info(f"{key} field found but no valid file upload: hasattr(file)={hasattr(value, 'file')}, filename={getattr(value, 'filename', 'None')}")
-            else:
-                # Special handling for checkboxes
-                if key in ['first_nations', 'disability']:
-                    visitor_data[key] = 'true' if value == 'true' else 'false'
-                else:
-                    visitor_data[key] = value
-        
-        logger.info(f"Final visitor_data keys: {list(visitor_data.keys())}")
-        
-        # Process country codes and phone numbers
-        country_code = visitor_data.get('country_code')
-        mobile = visitor_data.get('mobile')
-        alt_country_code = visitor_data.get('alt_country_code') 
-        alt_number = visitor_data.get('alt_number')
-        
-        # Handle mobile number with country code
-        if country_code and mobile:
-            # Extract country code from dropdown selection (e.g., "United States +1" -> "+1")
-            code_part = country_code.split(' +')[-1] if ' +' in country_code else ''
-            if code_part:
-                # If mobile doesn't already have the country code, add it
-                mobile_clean = str(mobile).strip()
-                if not mobile_clean.startswith('+'):
-                    visitor_data['mobile'] = f"+{code_part} {mobile_clean}"
-                    logger.info(f"Updated mobile with country code: {visitor_data['mobile']}")
-                else:
-                    visitor_data['mobile'] = mobile_clean
-                    logger.info(f"Mobile already has country code: {visitor_data['mobile']}")
-        elif mobile:
-            # Just use the mobile number as-is if no country code selected
-            visitor_data['mobile'] = str(mobile).strip()
-            logger.info(f"Mobile number without country code selection: {visitor_data['mobile']}")
-        
-        # Handle alternate number with country code
-        if alt_country_code and alt_number:
-            # Extract country code from dropdown selection
-            alt_code_part = alt_country_code.split(' +')[-1] if ' +' in alt_country_code else ''
-            if alt_code_part:
-                # If alt_number doesn't already have the country code, add it
-                alt_number_clean = str(alt_number).strip()
-                if not alt_number_clean.startswith('+'):
-                    visitor_data['alt_number'] = f"+{alt_code_part} {alt_number_clean}"
-                    logger.info(f"Updated alt_number with country code: {visitor_data['alt_number']}")
-                else:
-                    visitor_data['alt_number'] = alt_number_clean
-                    logger.info(f"Alt number already has country code: {visitor_data['alt_number']}")
-        elif alt_number:
-            # Just use the alt number as-is if no country code selected
-            visitor_data['alt_number'] = str(alt_number).strip()
-            logger.info(f"Alt number without country code selection: {visitor_data['alt_number']}")
-        
-        # Remove the separate country code fields since we've merged them into the phone numbers
-        visitor_data.pop('country_code', None)
-        visitor_data.pop('alt_country_code', None)
-        
-        # Log file upload details
-        for upload_type in ['photo_upload', 'signature_upload', 'id_document_upload']:
-            if upload_type in visitor_data:
-                logger.info(f"{upload_type} details: filename={visitor_data[upload_type]['filename']}, size={len(visitor_data[upload_type]['file_data'])} bytes")
+        # Handle file uploads from both standard form uploads and Uppy Dashboard
+        for key, upload, path, size in await spool_form_uploads(form_data):
+            upload_paths.append(path)
+            visitor_data[f'{key}_upload'] = {
+                'filename': upload.filename,
+                'content_type': upload.content_type or 'application/octet-stream',
+                'path': path,
+                'size': size
+            }
+        
+        # Merge the country code dropdowns into the phone numbers and drop the separate fields
+        for number_field, code_field in PHONE_FIELDS:
+            number = normalize_phone(visitor_data.pop(code_field, None), visitor_data.get(number_field))
+            if number:
+                visitor_data[number_field] = number
+        
+        # Log the final fields and upload details
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Final visitor_data keys: {list(visitor_data.keys())}")
+            for upload_type in ['photo_upload', 'signature_upload', 'id_document_upload']:
+                if upload_type in visitor_data:
+                    logger.debug(f"{upload_type} details: filename={visitor_data[upload_type]['filename']}, size={visitor_data[upload_type]['size']} bytes")
         
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
+        async def create(driver):
+            from automation.visitors import VisitorAutomation
+            visitor_automation = VisitorAutomation(driver, websocket=app.state.batched_sender)
+            
+            # Create/update visitor using the automation
+            return await run_selenium(visitor_automation.create_update_visitor, visitor_data)
         
-        # Create/update visitor using the automation
-        result = await visitor_automation.create_update_visitor(visitor_data)
+        result = await ingest_batcher.submit(create)
         
         return {"success": True, "visitor_id": result.get("visitor_id"), "message": "Visitor created successfully"}
         
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Failed to create visitor: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
+        remove_spooled_uploads(upload_paths)
 
-@app.post("/visitors/update")
-async def update_visitor(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+@app.post("/visitors/update", responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}})
+async def update_visitor(request: Request, auth_data: dict = _auth_required):
+    upload_paths = []
     try:
         # Get form data from request
         form_data = await request.form()
@@ -1065,229 +626,137 @@ async def update_visitor(request: Request, auth_data: dict = Depends(verify_auth
             raise HTTPException(status_code=400, detail="Search term is required to find the visitor to update")
         
         logger.info(f"Update request - Search term: {search_term}")
-        logger.info(f"Form data keys: {list(form_data.keys())}")
-        
-        # Create visitor data dictionary with only non-empty fields
-        visitor_data = {}
-        
-        # Field mapping for form data to visitor attributes
-        field_mapping = {
-            'initials': 'initials',
-            'first_name': 'first_name',
-            'last_name': 'last_name',
-            'id_number': 'id_number',
-            'company': 'company',
-            'mobile': 'mobile',
-            'email': 'email',
-            'address': 'address',
-            'nationality': 'nationality',
-            'comments': 'comments',
-            'reason_for_visit': 'reason_for_visit',
-            'first_nations': 'first_nations',
-            'disability': 'disability',
-            'date_of_birth': 'date_of_birth',
-            'country_of_issue': 'country_of_issue',
-            'alt_number': 'alt_number',
-            'gender': 'gender'
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Form data keys: {list(form_data.keys())}")
+        
+        # Read every field the update uses once; only non-empty values are kept
+        fields = clean_form_fields(form_data, VISITOR_UPDATE_FORM_KEYS)
+        visitor_data = {
+            key: fields[key] for key in VISITOR_UPDATE_FIELDS
+            if key in fields and key not in CHECKBOX_FIELDS
         }
         
-        # Only include fields that have actual values
-        for form_key, attr_name in field_mapping.items():
-            value = form_data.get(form_key)
-            if value and str(value).strip():  # Only set if value exists and is not just whitespace
-                # Special handling for checkboxes - only process if change flag is set
-                if form_key in ['first_nations', 'disability']:
-                    change_flag = form_data.get(f'{form_key}_change')
-                    if change_flag == 'true':  # Only update if user explicitly wants to change it
-                        visitor_data[attr_name] = 'true' if value == 'true' else 'false'
-                        logger.info(f"Updated checkbox {form_key} -> {attr_name}: {visitor_data[attr_name]} (change requested)")
-                    else:
-                        logger.info(f"Skipping checkbox {form_key} - no change requested")
-                else:
-                    visitor_data[attr_name] = str(value).strip()
-                    logger.info(f"Added field {form_key} -> {attr_name}: {visitor_data[attr_name]}")
-            else:
-                # For checkboxes, only process unchecking if change flag is set
-                if form_key in ['first_nations', 'disability']:
-                    change_flag = form_data.get(f'{form_key}_change')
-                    if change_flag == 'true':  # Only update if user explicitly wants to change it
-                        visitor_data[attr_name] = 'false'  # Explicitly set to false when unchecked and change requested
-                        logger.info(f"Updated checkbox {form_key} -> {attr_name}: false (unchecked, change requested)")
-                    else:
-                        logger.info(f"Skipping checkbox {form_key} - no change requested")
-                else:
-                    logger.info(f"Skipping empty field {form_key}: '{value}'")
+        # Checkboxes are only sent when the user explicitly asked to change them;
+        # an unchecked box with the change flag set means 'false'
+        visitor_data.update({
+            key: 'true' if fields.get(key) == 'true' else 'false'
+            for key in CHECKBOX_FIELDS if fields.get(f'{key}_change') == 'true'
+        })
+        logger.debug("Update fields: %s", visitor_data)
         
         # Process country codes and phone numbers for update
-        country_code = form_data.get('country_code')
-        mobile = form_data.get('mobile')
-        alt_country_code = form_data.get('alt_country_code') 
-        alt_number = form_data.get('alt_number')
-        
-        # Handle mobile number with country code
-        if country_code and mobile:
-            # Extract country code from dropdown selection (e.g., "United States +1" -> "+1")
-            code_part = country_code.split(' +')[-1] if ' +' in str(country_code) else ''
-            if code_part:
-                # If mobile doesn't already have the country code, add it
-                mobile_clean = str(mobile).strip()
-                if not mobile_clean.startswith('+'):
-                    visitor_data['mobile'] = f"+{code_part} {mobile_clean}"
-                    logger.info(f"Updated mobile with country code: {visitor_data['mobile']}")
-                else:
-                    visitor_data['mobile'] = mobile_clean
-                    logger.info(f"Mobile already has country code: {visitor_data['mobile']}")
-        elif mobile and str(mobile).strip():
-            # Just use the mobile number as-is if no country code selected
-            visitor_data['mobile'] = str(mobile).strip()
-            logger.info(f"Mobile number without country code selection: {visitor_data['mobile']}")
-        
-        # Handle alternate number with country code
-        if alt_country_code and alt_number:
-            # Extract country code from dropdown selection
-            alt_code_part = alt_country_code.split(' +')[-1] if ' +' in str(alt_country_code) else ''
-            if alt_code_part:
-                # If alt_number doesn't already have the country code, add it
-                alt_number_clean = str(alt_number).strip()
-                if not alt_number_clean.startswith('+'):
-                    visitor_data['alt_number'] = f"+{alt_code_part} {alt_number_clean}"
-                    logger.info(f"Updated alt_number with country code: {visitor_data['alt_number']}")
-                else:
-                    visitor_data['alt_number'] = alt_number_clean
-                    logger.info(f"Alt number already has country code: {visitor_data['alt_number']}")
-        elif alt_number and str(alt_number).strip():
-            # Just use the alt number as-is if no country code selected
-            visitor_data['alt_number'] = str(alt_number).strip()
-            logger.info(f"Alt number without country code selection: {visitor_data['alt_number']}")
+        for number_field, code_field in PHONE_FIELDS:
+            number = normalize_phone(fields.get(code_field), fields.get(number_field))
+            if number:
+                visitor_data[number_field] = number
         
         # Handle file uploads separately with enhanced Uppy support
         files = {}
-        file_fields = ['photo', 'signature', 'id_document']
-        for field_name in file_fields:
-            file_upload = form_data.get(field_name)
-            if file_upload and hasattr(file_upload, 'filename') and file_upload.filename and file_upload.filename.strip():
-                file_content = await file_upload.read()
-                # Only process files that actually have content
-                if file_content and len(file_content) > 0:
-                    files[f'{field_name}_upload'] = {
-                        'filename': file_upload.filename,
-                        'content_type': file_upload.content_type or 'application/octet-stream',
-                        'content': file_content
-                    }
-                    logger.info(f"Found file upload for {field_name}: {file_upload.filename} ({len(file_content)} bytes)")
-                else:
-                    logger.warning(f"File upload for {field_name} has no content")
-            else:
-                logger.info(f"No valid file upload found for {field_name}")
+        for key, upload, path, size in await spool_form_uploads(form_data):
+            upload_paths.append(path)
+            files[f'{key}_upload'] = {
+                'filename': upload.filename,
+                'content_type': upload.content_type or 'application/octet-stream',
+                'path': path,
+                'size': size
+            }
         
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        # Use the new visitor create/update automation class
-        from automation.visitor_create_update import VisitorCreateUpdateAutomation
-        visitor_automation = VisitorCreateUpdateAutomation(driver)
-        
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        # Update visitor using the new automation that follows the exact EVTrack workflow
-        result = await visitor_automation.update_visitor_profile(search_term, visitor_data, files)
-        
-        if result['success']:
-            return {
-                "success": True, 
-                "message": result['message'],
-                "updated_fields": result['updated_fields'],
-                "visitor_name": result.get('visitor_name'),
-                "uuid": result.get('visitor_uuid')
-            }
-        else:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Unknown error'))
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            from automation.visitor_create_update import VisitorCreateUpdateAutomation
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            # Use the new visitor create/update automation class
+            visitor_automation = VisitorCreateUpdateAutomation(driver, websocket=app.state.batched_sender)
+            
+            # Update visitor using the new automation that follows the exact EVTrack workflow
+            result = await run_selenium(visitor_automation.update_visitor_profile, search_term, visitor_data, files)
+            
+            if result['success']:
+                return {
+                    "success": True, 
+                    "message": result['message'],
+                    "updated_fields": result['updated_fields'],
+                    "visitor_name": result.get('visitor_name'),
+                    "uuid": result.get('visitor_uuid')
+                }
+            else:
+                raise HTTPException(status_code=400, detail=result.get('error', 'Unknown error'))
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to update visitor: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
+        remove_spooled_uploads(upload_paths)
 
-@app.get("/visitors/{visitor_id}")
-async def get_visitor(visitor_id: str, auth_data: dict = Depends(verify_auth)):
-    driver = None
+@app.get("/visitors/{visitor_id}", responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}})
+async def get_visitor(visitor_id: str, auth_data: dict = _auth_required):
     try:
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        details = await visitor_automation.get_visitor_detail(visitor_id)
-        
-        if details:
-            # First try to get the portrait image
-            try:
-                # Wait for portrait image to be available
-                await driver.wait_for_selector(".visitor-portrait img, .visitor-photo img", timeout=5000)
-                image_element = driver.find_element(By.CSS_SELECTOR, ".visitor-portrait img, .visitor-photo img")
-                portrait_url = image_element.get_attribute('src')
-                logger.info(f"Found portrait image: {portrait_url}")
-            except Exception as e:
-                logger.warning(f"Could not find portrait image: {str(e)}")
-                portrait_url = None
-
-            visitor_data = {
-                "id": visitor_id,
-                "first_name": details.get("first_name", ""),
-                "last_name": details.get("last_name", ""),
-                "company": details.get("company", ""),
-                "mobile": details.get("mobile", ""),
-                "nationality": details.get("nationality", ""),
-                "country_of_issue": details.get("country_of_issue", ""),
-                "email": details.get("email", ""),
-                "reason_for_visit": details.get("reason_for_visit", ""),
-                "created_by": details.get("created_by", ""),
-                "guard_house": details.get("guard_house", ""),
-                "created_at": details.get("created_at", ""),
-                "updated_at": details.get("updated_at", ""),
-                "status": "Current", 
-                "portrait_url": portrait_url,
-                "profile_url": f"https://app.evtrack.com/visitor/edit?uuid={visitor_id}"
-            }
-            return visitor_data
-        else:
-            raise HTTPException(status_code=404, detail="Visitor not found")
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            from automation.visitors import VisitorAutomation
+            visitor_automation = VisitorAutomation(driver, websocket=app.state.batched_sender)
+            
+            details = await run_selenium(visitor_automation.get_visitor_detail, visitor_id)
+            
+            if details:
+                # First try to get the portrait image
+                try:
+                    # One script round trip on the Selenium pool; find_element would sit out the implicit wait when there's no portrait
+                    portrait_url = await run_selenium(
+                        driver.execute_script,
+                        "const img = document.querySelector(arguments[0]); return img ? img.src : null;",
+                        ".visitor-portrait img, .visitor-photo img"
+                    )
+                    logger.info(f"Found portrait image: {portrait_url}")
+                except Exception as e:
+                    logger.warning(f"Could not find portrait image: {str(e)}")
+                    portrait_url = None
+
+                visitor_data = {
+                    "id": visitor_id,
+                    "first_name": details.get("first_name", ""),
+                    "last_name": details.get("last_name", ""),
+                    "company": details.get("company", ""),
+                    "mobile": details.get("mobile", ""),
+                    "nationality": details.get("nationality", ""),
+                    "country_of_issue": details.get("country_of_issue", ""),
+                    "email": details.get("email", ""),
+                    "reason_for_visit": details.get("reason_for_visit", ""),
+                    "created_by": details.get("created_by", ""),
+                    "guard_house": details.get("guard_house", ""),
+                    "created_at": details.get("created_at", ""),
+                    "updated_at": details.get("updated_at", ""),
+                    "status": "Current", 
+                    "portrait_url": portrait_url,
+                    "profile_url": f"https://app.evtrack.com/visitor/edit?uuid={visitor_id}"
+                }
+                return visitor_data
+            else:
+                raise HTTPException(status_code=404, detail="Visitor not found")
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Failed to get visitor details: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
-@app.post("/vehicles/add")
-async def add_vehicle(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+@app.post("/vehicles/add", responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}})
+async def add_vehicle(request: Request, auth_data: dict = _auth_required):
     try:
         # Get form data from request
-        form_data = await request.form()
+        form_data = await request.form(max_files=0, max_fields=TEXT_FORM_MAX_FIELDS)
         
         # Extract search term for visitor
         search_term = form_data.get('search_term')
@@ -1297,24 +766,7 @@ async def add_vehicle(request: Request, auth_data: dict = Depends(verify_auth)):
         logger.info(f"Add vehicle request - Search term: {search_term}")
         
         # Create vehicle data from form
-        vehicle_data = {}
-        vehicle_fields = [
-            'number_plate', 'vehicle_type', 'make', 'model', 'year', 
-            'colour', 'vin', 'engine_number', 'licence_disc_number', 
-            'licence_expiry_date', 'document_number', 'comments'
-        ]
-        
-        for field in vehicle_fields:
-            value = form_data.get(field)
-            if value and str(value).strip():
-                if field == 'year':
-                    try:
-                        vehicle_data[field] = int(value)
-                    except ValueError:
-                        continue
-                else:
-                    vehicle_data[field] = str(value).strip()
-                logger.info(f"Added vehicle field {field}: {vehicle_data[field]}")
+        vehicle_data = parse_form_fields(form_data, VEHICLE_FIELDS)
         
         # Validate that at least VIN or number_plate is provided
         if not vehicle_data.get('vin') and not vehicle_data.get('number_plate'):
@@ -1323,39 +775,34 @@ async def add_vehicle(request: Request, auth_data: dict = Depends(verify_auth)):
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        vehicle_automation = VehicleAutomation(driver)
-        
-        # Add the vehicle using the new method that follows exact EVTrack workflow
-        result = await vehicle_automation.add_vehicle(search_term, vehicle_data)
-        
-        if result['success']:
-            return {
-                "success": True, 
-                "message": result['message'],
-                "search_term": search_term,
-                "vehicle_data": vehicle_data,
-                "visitor_name": result.get('visitor_name'),
-                "visitor_uuid": result.get('visitor_uuid')
-            }
-        else:
-            raise HTTPException(status_code=400, detail=result.get('message', 'Failed to add vehicle to visitor profile'))
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            from automation.vehicles import VehicleAutomation
+            vehicle_automation = VehicleAutomation(driver)
+            
+            # Add the vehicle using the new method that follows exact EVTrack workflow
+            result = await run_selenium(vehicle_automation.add_vehicle, search_term, vehicle_data)
+            
+            if result['success']:
+                return {
+                    "success": True, 
+                    "message": result['message'],
+                    "search_term": search_term,
+                    "vehicle_data": vehicle_data,
+                    "visitor_name": result.get('visitor_name'),
+                    "visitor_uuid": result.get('visitor_uuid')
+                }
+            else:
+                raise HTTPException(status_code=400, detail=result.get('message', 'Failed to add vehicle to visitor profile'))
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to add vehicle: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/vehicles/update",
@@ -1367,13 +814,13 @@ async def add_vehicle(request: Request, auth_data: dict = Depends(verify_auth)):
         400: {"description": "Invalid input data or vehicle not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def update_vehicle(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+async def update_vehicle(request: Request, auth_data: dict = _auth_required):
     try:
         # Get form data from request
-        form_data = await request.form()
+        form_data = await request.form(max_files=0, max_fields=TEXT_FORM_MAX_FIELDS)
         
         # Extract search term for vehicle
         search_term = form_data.get('search_term')
@@ -1383,24 +830,7 @@ async def update_vehicle(request: Request, auth_data: dict = Depends(verify_auth
         logger.info(f"Update vehicle request - Search term: {search_term}")
         
         # Create vehicle data from form (only include fields that have values)
-        vehicle_data = {}
-        vehicle_fields = [
-            'number_plate', 'vehicle_type', 'make', 'model', 'year', 
-            'colour', 'vin', 'engine_number', 'licence_disc_number', 
-            'licence_expiry_date', 'document_number', 'comments'
-        ]
-        
-        for field in vehicle_fields:
-            value = form_data.get(field)
-            if value and str(value).strip():
-                if field == 'year':
-                    try:
-                        vehicle_data[field] = int(value)
-                    except ValueError:
-                        continue
-                else:
-                    vehicle_data[field] = str(value).strip()
-                logger.info(f"Will update vehicle field {field}: {vehicle_data[field]}")
+        vehicle_data = parse_form_fields(form_data, VEHICLE_FIELDS)
         
         # Check if any fields were provided for update
         if not vehicle_data:
@@ -1409,38 +839,33 @@ async def update_vehicle(request: Request, auth_data: dict = Depends(verify_auth
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        vehicle_automation = VehicleAutomation(driver)
-        
-        # Update the vehicle using the new method that goes to vehicle list
-        result = await vehicle_automation.update_vehicle(search_term, vehicle_data)
-        
-        if result['success']:
-            return {
-                "success": True, 
-                "message": result['message'],
-                "search_term": search_term,
-                "vehicle_data": vehicle_data,
-                "updated_fields": result.get('updated_fields', [])
-            }
-        else:
-            raise HTTPException(status_code=400, detail=result.get('message', 'Failed to update vehicle'))
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            from automation.vehicles import VehicleAutomation
+            vehicle_automation = VehicleAutomation(driver)
+            
+            # Update the vehicle using the new method that goes to vehicle list
+            result = await run_selenium(vehicle_automation.update_vehicle, search_term, vehicle_data)
+            
+            if result['success']:
+                return ORJSONResponse({
+                    "success": True,
+                    "message": result['message'],
+                    "search_term": search_term,
+                    "vehicle_data": vehicle_data,
+                    "updated_fields": result.get('updated_fields', [])
+                })
+            else:
+                raise HTTPException(status_code=400, detail=result.get('message', 'Failed to update vehicle'))
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to update vehicle: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/credentials/add",
@@ -1452,13 +877,13 @@ async def update_vehicle(request: Request, auth_data: dict = Depends(verify_auth
         400: {"description": "Invalid input data or visitor not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def add_credential(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+async def add_credential(request: Request, auth_data: dict = _auth_required):
     try:
         # Get form data from request
-        form_data = await request.form()
+        form_data = await request.form(max_files=0, max_fields=TEXT_FORM_MAX_FIELDS)
         
         # Extract search term for visitor
         search_term = form_data.get('search_term')
@@ -1469,40 +894,11 @@ async def add_credential(request: Request, auth_data: dict = Depends(verify_auth
         
         # Create credential data from form
         credential_data = {}
-        credential_fields = [
-            'reader_type', 'unique_identifier', 'pin', 'active_date', 
-            'expiry_date', 'use_limit', 'comments', 'status'
-        ]
-        
         # Handle time fields separately with validation
-        time_fields = ['active_time', 'expiry_time']
-        for time_field in time_fields:
-            time_value = form_data.get(time_field)
-            if time_value and str(time_value).strip():
-                time_str = str(time_value).strip()
-                try:
-                    # Validate and get properly formatted time
-                    validated_time = validate_time_format(time_str)
-                    credential_data[time_field] = validated_time
-                    logger.info(f"Added credential time field {time_field}: {credential_data[time_field]}")
-                except HTTPException as e:
-                    # Re-raise the validation error
-                    raise e
-        
-        for field in credential_fields:
-            value = form_data.get(field)
-            if value and str(value).strip():
-                if field == 'use_limit':
-                    try:
-                        credential_data[field] = int(value)
-                    except ValueError:
-                        continue
-                elif field in ['active_date', 'expiry_date']:
-                    # Handle date fields
-                    credential_data[field] = str(value).strip()
-                else:
-                    credential_data[field] = str(value).strip()
-                logger.info(f"Added credential field {field}: {credential_data[field]}")
+        time_values = clean_form_fields(form_data, ('active_time', 'expiry_time'))
+        credential_data.update(validate_and_clean_time_fields(time_values))
+        
+        credential_data.update(parse_form_fields(form_data, CREDENTIAL_ADD_FIELDS))
         
         # Handle access_control_lists checkbox
         access_control_lists = form_data.get('access_control_lists')
@@ -1515,44 +911,39 @@ async def add_credential(request: Request, auth_data: dict = Depends(verify_auth
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        credential_automation = CredentialAutomation(driver)
-        
-        # First search for the visitor to get UUID
-        uuid, url = credential_automation.search_visitor_for_credentials(search_term)
-        if not uuid:
-            raise HTTPException(status_code=404, detail=f"Visitor not found with search term: {search_term}")
+        # Create CredentialData object. Every field was already stripped, int-converted or
+        # time-validated above, so skip re-running Pydantic's validators
+        credential_data_obj = CredentialData.model_construct(**credential_data)
         
-        # Create CredentialData object
-        credential_data_obj = CredentialData(**credential_data)
+        async def add(driver):
+            from automation.credentials import CredentialAutomation
+            credential_automation = CredentialAutomation(driver)
+            
+            # First search for the visitor to get UUID
+            uuid, url = await run_selenium(credential_automation.search_visitor_for_credentials, search_term)
+            if not uuid:
+                raise HTTPException(status_code=404, detail=f"Visitor not found with search term: {search_term}")
+            
+            # Add the credential
+            return uuid, await run_selenium(credential_automation.add_credential, uuid, credential_data_obj)
         
-        # Add the credential
-        success = credential_automation.add_credential(uuid, credential_data_obj)
+        uuid, success = await ingest_batcher.submit(add)
         
         if success:
-            return {"status": "success",
+            # Built as an ORJSONResponse so the model is dumped once instead of going through jsonable_encoder
+            return ORJSONResponse({"status": "success",
                 "message": "Credential added successfully",
                 "visitor_uuid": uuid,
-                "credential_data": credential_data_obj
-            }
+                "credential_data": credential_data_obj.model_dump(mode="json")
+            })
         else:
             raise HTTPException(status_code=400, detail="Failed to add credential")
         
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to add credential: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/credentials/update",
@@ -1564,13 +955,13 @@ async def add_credential(request: Request, auth_data: dict = Depends(verify_auth
         400: {"description": "Invalid input data or credential not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def update_credential(request: Request, auth_data: dict = Depends(verify_auth)):
-    driver = None
+async def update_credential(request: Request, auth_data: dict = _auth_required):
     try:
         # Get form data from request
-        form_data = await request.form()
+        form_data = await request.form(max_files=0, max_fields=TEXT_FORM_MAX_FIELDS)
         
         # Extract search term and credential search detail
         search_term = form_data.get('search_term')
@@ -1585,76 +976,44 @@ async def update_credential(request: Request, auth_data: dict = Depends(verify_a
         
         # Create credential data from form (only fields to update)
         credential_data = {}
-        credential_fields = [
-            'active_date', 'expiry_date', 'use_limit', 'comments', 'status'
-        ]
-        
         # Handle time fields separately with validation
-        time_fields = ['active_time', 'expiry_time']
-        for time_field in time_fields:
-            time_value = form_data.get(time_field)
-            if time_value and str(time_value).strip():
-                time_str = str(time_value).strip()
-                try:
-                    # Validate and get properly formatted time
-                    validated_time = validate_time_format(time_str)
-                    credential_data[time_field] = validated_time
-                    logger.info(f"Added credential time field {time_field}: {credential_data[time_field]}")
-                except HTTPException as e:
-                    # Re-raise the validation error
-                    raise e
-        
-        for field in credential_fields:
-            value = form_data.get(field)
-            if value and str(value).strip():
-                if field == 'use_limit':
-                    try:
-                        credential_data[field] = int(value)
-                    except ValueError:
-                        continue
-                elif field in ['active_date', 'expiry_date']:
-                    credential_data[field] = str(value).strip()
-                else:
-                    credential_data[field] = str(value).strip()
-                logger.info(f"Added credential field {field}: {credential_data[field]}")
+        time_values = clean_form_fields(form_data, ('active_time', 'expiry_time'))
+        credential_data.update(validate_and_clean_time_fields(time_values))
+        
+        credential_data.update(parse_form_fields(form_data, CREDENTIAL_UPDATE_FIELDS))
 
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        credential_automation = CredentialAutomation(driver)
-        
-        # Create CredentialData object
-        credential_data_obj = CredentialData(**credential_data)
-        
-        # Update the credential using the new method
-        success = credential_automation.update_credential(search_term, credential_search_detail, credential_data_obj)
-        
-        if success:
-            return {"status": "success", 
-                "message": "Credential updated successfully",
-                "search_term": search_term,
-                "credential_search_detail": credential_search_detail,
-                "updated_data": credential_data_obj
-            }
-        else:
-            raise HTTPException(status_code=400, detail="Failed to update credential")
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            from automation.credentials import CredentialAutomation
+            credential_automation = CredentialAutomation(driver)
+            
+            # Create CredentialData object (fields already validated above)
+            credential_data_obj = CredentialData.model_construct(**credential_data)
+            
+            # Update the credential using the new method
+            success = await run_selenium(credential_automation.update_credential, search_term, credential_search_detail, credential_data_obj)
+            
+            if success:
+                return ORJSONResponse({"status": "success",
+                    "message": "Credential updated successfully",
+                    "search_term": search_term,
+                    "credential_search_detail": credential_search_detail,
+                    "updated_data": credential_data_obj.model_dump(mode="json")
+                })
+            else:
+                raise HTTPException(status_code=400, detail="Failed to update credential")
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to update credential: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/visitors/invite",
@@ -1666,14 +1025,14 @@ async def update_credential(request: Request, auth_data: dict = Depends(verify_a
         400: {"description": "Invalid input data or visitor not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def invite_visitor(request: Request, auth_data: dict = Depends(verify_auth)):
+async def invite_visitor(request: Request, auth_data: dict = _auth_required):
     """Invite a visitor by searching for them first."""
-    driver = None
     try:
         # Get form data from request
-        form_data = await request.form()
+        form_data = await request.form(max_files=0, max_fields=TEXT_FORM_MAX_FIELDS)
         
         # Extract search term
         search_term = form_data.get('search_term')
@@ -1682,34 +1041,15 @@ async def invite_visitor(request: Request, auth_data: dict = Depends(verify_auth
             raise HTTPException(status_code=400, detail="Search term is required to find the visitor")
         
         logger.info(f"Invite visitor request - Search term: {search_term}")
-        logger.info(f"Form data received: {dict(form_data)}")
-        
-        # Extract invitation form data - using direct values from form
-        location_mapping = {
-            "Select Location...": "",
-            "Inherited - Default Visitor Access List": "0",
-            "IO Main Campus": "2715"
-        }
-        
-        # Map visit reason display names to numeric IDs
-        visit_reason_mapping = {
-            "None": "0",
-            "Visitor": "642",
-            "Delivery": "643", 
-            "Guest House Visitor": "645",
-            "Parent Pickup/Dropoff": "647",
-            "Staff": "648",
-            "Tour": "646"
-        }
         
-        # Get form values and map display names to IDs
+        # Extract invitation form data, mapping display names to IDs
         location_display = form_data.get('locationId', '')
         visit_reason_display = form_data.get('visitReasonId', 'Parent Pickup/Dropoff')
         
         invite_data = {
             'credentialReaderType': form_data.get('credentialReaderType', 'QR_CODE'),
-            'visitReasonId': visit_reason_mapping.get(visit_reason_display, '647'),  # Map display name to numeric ID
-            'locationId': location_mapping.get(location_display, ''),  # Map display name to ID
+            'visitReasonId': VISIT_REASON_IDS.get(visit_reason_display, '647'),  # Map display name to numeric ID
+            'locationId': LOCATION_IDS.get(location_display, ''),  # Map display name to ID
             'activateDate': form_data.get('activateDate', ''),
             'activateTime': form_data.get('activateTime', ''),
             'expiryDate': form_data.get('expiryDate', ''),
@@ -1721,50 +1061,42 @@ async def invite_visitor(request: Request, auth_data: dict = Depends(verify_auth
         if not invite_data['locationId']:
             raise HTTPException(status_code=400, detail="Location is required")
         
-        logger.info(f"Processed invite data: {invite_data}")
+        logger.debug("Processed invite data: %s", invite_data)
         
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        
-        # Use InvitationAutomation
-        from automation.invitation import InvitationAutomation
-        invitation_automation = InvitationAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            invitation_automation.set_websocket(app.state.active_websocket)
-        
-        # Invite visitor using the invitation automation - it handles login automatically
-        result = await invitation_automation.invite_visitor(
-            search_term, 
-            invite_data, 
-            username=EVTRACK_EMAIL, 
-            password=EVTRACK_PASSWORD
-        )
-        
-        if result['success']:
-            return {
-                "success": True,
-                "message": result['message'],
-                "visitor_uuid": result['visitor_uuid'],
-                "visitor_name": result['visitor_name'],
-                "invite_settings": result['invite_settings']
-            }
-        else:
-            raise HTTPException(status_code=400, detail=result.get('error', 'Failed to invite visitor'))
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            
+            # Use InvitationAutomation
+            from automation.invitation import InvitationAutomation
+            invitation_automation = InvitationAutomation(driver, websocket=app.state.batched_sender)
+            
+            # Invite visitor using the invitation automation - it handles login automatically
+            result = await run_selenium(
+                invitation_automation.invite_visitor,
+                search_term, 
+                invite_data, 
+                username=EVTRACK_EMAIL, 
+                password=EVTRACK_PASSWORD
+            )
+            
+            if result['success']:
+                return {
+                    "success": True,
+                    "message": result['message'],
+                    "visitor_uuid": result['visitor_uuid'],
+                    "visitor_name": result['visitor_name'],
+                    "invite_settings": result['invite_settings']
+                }
+            else:
+                raise HTTPException(status_code=400, detail=result.get('error', 'Failed to invite visitor'))
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to invite visitor: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/visitors/badge",
@@ -1792,32 +1124,17 @@ async def invite_visitor(request: Request, auth_data: dict = Depends(verify_auth
         400: {"description": "Invalid input data or visitor not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def get_visitor_badge(request: Request, auth_data: dict = Depends(verify_auth)):
+async def get_visitor_badge(request: Request, auth_data: dict = _auth_required):
     """Generate and download a visitor badge by searching for them first."""
-    driver = None
     try:
-        # Handle both form data and JSON
-        search_term = None
-        
-        # Try form data first (for Swagger UI)
-        try:
-            form_data = await request.form()
-            # Debug: log all form fields
-            logger.info(f"Badge: All form fields: {dict(form_data)}")
-            # Support both 'search' (from OpenAPI spec) and 'search_term' (from HTML site)
-            search_term = form_data.get('search') or form_data.get('search_term')
-            logger.info(f"Badge: Received form data: search={form_data.get('search')}, search_term={form_data.get('search_term')}")
-        except Exception as form_error:
-            logger.info(f"Badge: Form parsing failed: {form_error}")
-            # Try JSON if form data fails
-            try:
-                json_data = await request.json()
-                search_term = json_data.get('search') or json_data.get('search_term')
-                logger.info(f"Badge: Received JSON data: search={json_data.get('search')}, search_term={json_data.get('search_term')}")
-            except Exception as json_error:
-                logger.info(f"Badge: JSON parsing failed: {json_error}")
+        # Handle both form data (Swagger UI) and JSON
+        body = await read_request_fields(request)
+        # Support both 'search' (from OpenAPI spec) and 'search_term' (from HTML site)
+        search_term = body.get('search') or body.get('search_term')
+        logger.info(f"Badge: Received search={body.get('search')}, search_term={body.get('search_term')}")
         
         if not search_term:
             logger.error("Badge: No search term found in request")
@@ -1828,69 +1145,57 @@ async def get_visitor_badge(request: Request, auth_data: dict = Depends(verify_a
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        
-        # Navigate directly to visitor list instead of going through dashboard
-        driver.get('https://app.evtrack.com/visitor/list')
-        
-        # Handle login if redirected
-        if '/login' in driver.current_url:
-            login = EvTrackLogin(driver)
-            await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-            # After login, navigate back to visitor list
-            driver.get('https://app.evtrack.com/visitor/list')
-        
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        # Generate badge using the automation
-        result = await visitor_automation.get_visitor_badge(search_term)
-        
-        # Decode the base64 content to get the raw file bytes
-        import base64
-        badge_bytes = base64.b64decode(result['badge_content'])
-        
-        # Return the file directly for download in Swagger UI
-        from fastapi.responses import Response
-        
-        # Determine the appropriate content type and file extension
-        content_type = result.get('content_type', 'application/pdf')
-        visitor_name = result['visitor_name'].replace(' ', '_').replace(',', '').replace('.', '')
-        
-        # Create a clean filename
-        if content_type == 'application/pdf':
-            filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.pdf"
-        elif 'image' in content_type:
-            ext = 'png' if 'png' in content_type else 'jpg'
-            filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.{ext}"
-        else:
-            filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.pdf"
-        
-        logger.info(f"Returning badge file: {filename}, Content-Type: {content_type}, Size: {len(badge_bytes)} bytes")
-        
-        # Return the badge file directly for download
-        return Response(
-            content=badge_bytes,
-            media_type=content_type,
-            headers={
-                "Content-Disposition": f"attachment; filename={filename}",
-                "Content-Length": str(len(badge_bytes))
-            }
-        )
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            
+            # Navigate directly to visitor list instead of going through dashboard
+            await run_selenium(driver.get, 'https://app.evtrack.com/visitor/list')
+            
+            # Handle login if redirected
+            if '/login' in await run_selenium(getattr, driver, 'current_url'):
+                from automation.login import EvTrackLogin
+                login = EvTrackLogin(driver)
+                await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+                # After login, navigate back to visitor list
+                await run_selenium(driver.get, 'https://app.evtrack.com/visitor/list')
+            
+            from automation.visitors import VisitorAutomation
+            visitor_automation = VisitorAutomation(driver, websocket=app.state.batched_sender)
+            
+            # Generate badge using the automation, asking for the raw file bytes
+            # since they go straight into the response body
+            result = await run_selenium(visitor_automation.get_visitor_badge, search_term, as_base64=False)
+            badge_bytes = result['badge_bytes']
+            
+            # Determine the appropriate content type and file extension
+            content_type = result.get('content_type', 'application/pdf')
+            visitor_name = result['visitor_name'].replace(' ', '_').replace(',', '').replace('.', '')
+            
+            # Create a clean filename
+            if content_type == 'application/pdf':
+                filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.pdf"
+            elif 'image' in content_type:
+                ext = 'png' if 'png' in content_type else 'jpg'
+                filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.{ext}"
+            else:
+                filename = f"badge_{visitor_name}_{result['visitor_uuid'][:8]}.pdf"
+            
+            logger.info(f"Returning badge file: {filename}, Content-Type: {content_type}, Size: {len(badge_bytes)} bytes")
+            
+            # Return the badge file directly for download
+            return Response(
+                content=badge_bytes,
+                media_type=content_type,
+                headers={
+                    "Content-Disposition": f"attachment; filename={filename}",
+                    "Content-Length": str(len(badge_bytes))
+                }
+            )
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to generate badge: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/visitors/profile",
@@ -1903,30 +1208,16 @@ async def get_visitor_badge(request: Request, auth_data: dict = Depends(verify_a
         404: {"description": "Visitor not found"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def get_visitor_profile(request: Request, auth_data: dict = Depends(verify_auth)):
+async def get_visitor_profile(request: Request, auth_data: dict = _auth_required):
     """Get comprehensive visitor profile by searching for them first, then navigating to profile tab."""
-    driver = None
     try:
-        # Try to get search term from multiple sources
-        search_term = None
-        
-        # Try JSON first
-        try:
-            json_data = await request.json()
-            search_term = json_data.get('search_term')
-            logger.info(f"Profile: Received JSON data: search_term={search_term}")
-        except:
-            # Try form data
-            try:
-                form_data = await request.form()
-                search_term = form_data.get('search_term')
-                logger.info(f"Profile: Received form data: search_term={search_term}")
-            except:
-                # Try query parameters
-                search_term = request.query_params.get('search_term')
-                logger.info(f"Profile: Received query params: search_term={search_term}")
+        # Get search term from a JSON or form body, falling back to query parameters
+        body = await read_request_fields(request)
+        search_term = body.get('search_term') or request.query_params.get('search_term')
+        logger.info(f"Profile: Received search_term={search_term}")
         
         if not search_term:
             logger.error("Profile: No search term found in request")
@@ -1937,49 +1228,41 @@ async def get_visitor_profile(request: Request, auth_data: dict = Depends(verify
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        # Use the same approach as invitation and badge generation - search first
-        from automation.visitor_search import VisitorSearchAutomation
-        search_automation = VisitorSearchAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            search_automation.set_websocket(app.state.active_websocket)
-        
-        # Search for the visitor using the reliable search method
-        visitor_data = await search_automation.search_visitor_case_insensitive(search_term)
-        
-        if not visitor_data:
-            raise HTTPException(status_code=404, detail=f"No visitor found for search term: {search_term}")
-        
-        # Now get comprehensive profile data using the new method
-        from automation.visitor_details import VisitorDetailsAutomation
-        details_automation = VisitorDetailsAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            details_automation.set_websocket(app.state.active_websocket)
-        
-        # Get complete profile information from the profile tab
-        profile_data = await details_automation.get_comprehensive_visitor_profile(visitor_data['uuid'])
-        
-        return {"success": True,
-            "visitor_uuid": visitor_data['uuid'],
-            "visitor_name": f"{visitor_data.get('first_name', '')} {visitor_data.get('last_name', '')}".strip(),
-            "profile": profile_data
-        }
-        
-    except HTTPException:
-        raise  # Re-raise HTTP exceptions as-is
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            from automation.visitor_search import VisitorSearchAutomation
+            from automation.visitor_details import VisitorDetailsAutomation
+            login = EvTrackLogin(driver)
+            search_automation = VisitorSearchAutomation(driver, websocket=app.state.batched_sender)
+            details_automation = VisitorDetailsAutomation(driver, websocket=app.state.batched_sender)
+            
+            async def fetch_profile():
+                await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
+                # Use the same approach as invitation and badge generation - search first
+                visitor_data = await search_automation.search_visitor_case_insensitive(search_term)
+                if not visitor_data:
+                    return None, None
+                # Get complete profile information from the profile tab
+                return visitor_data, await details_automation.get_comprehensive_visitor_profile(visitor_data['uuid'])
+            
+            # Each step needs the page the previous one left behind, so they run back to back
+            # in a single trip to the Selenium pool rather than one executor hop per step
+            visitor_data, profile_data = await run_selenium(fetch_profile)
+            
+            if not visitor_data:
+                raise HTTPException(status_code=404, detail=f"No visitor found for search term: {search_term}")
+            
+            return {"success": True,
+                "visitor_uuid": visitor_data['uuid'],
+                "visitor_name": f"{visitor_data.get('first_name', '')} {visitor_data.get('last_name', '')}".strip(),
+                "profile": profile_data
+            }
+            
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to get visitor profile: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 @app.post(
     "/login",
@@ -1990,38 +1273,45 @@ async def get_visitor_profile(request: Request, auth_data: dict = Depends(verify
         200: {"description": "Login successful"},
         401: {"description": "Authentication failed"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def test_login(auth_data: dict = Depends(verify_auth)):
-    """Test login functionality"""
-    driver = None
+async def test_login(full: bool = False, auth_data: dict = _auth_required):
+    """Test login functionality (pass full=true to always go through the browser login)"""
     try:
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials. Please check your .env file.")
-            
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        
-        # Test login
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        return {
-            "success": True, 
-            "message": "Login successful",
-            "user": auth_data.get("username", "unknown"),
-            "auth_type": auth_data.get("auth_type", "unknown")
-        }
         
+        # A live shared session already proves the credentials work; checking it is one
+        # HTTP request instead of a browser checkout and page loads
+        from automation.login import check_saved_session
+        if not full and await asyncio.to_thread(check_saved_session):
+            return {
+                "success": True,
+                "message": "Login successful",
+                "user": auth_data.get("username", "unknown"),
+                "auth_type": auth_data.get("auth_type", "unknown")
+            }
+            
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            
+            # Test login
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            return {
+                "success": True, 
+                "message": "Login successful",
+                "user": auth_data.get("username", "unknown"),
+                "auth_type": auth_data.get("auth_type", "unknown")
+            }
+            
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Login test failed: {str(e)}")
         raise HTTPException(status_code=401, detail=f"Login failed: {str(e)}")
-    finally:
-        if driver:
-            try:
-                driver.quit()
-                logger.info("Browser closed")
-            except Exception as e:
-                logger.error(f"Error closing browser: {str(e)}")
 
 # ===== GOOGLE SHEETS INTEGRATION ENDPOINTS =====
 
@@ -2037,101 +1327,10 @@ async def test_login(auth_data: dict = Depends(verify_auth)):
         500: {"description": "Internal server error"},
     }
 )
-async def create_visitors_from_sheets(request: Request, auth_data: dict = Depends(verify_auth)):
+async def create_visitors_from_sheets(auth_data: dict = _auth_required):
     """Bulk create visitors from Google Sheets formatted data"""
-    driver = None
-    try:
-        # Get JSON data containing sheet rows
-        json_data = await request.json()
-        sheet_data = json_data.get('sheet_data')
-        start_row = json_data.get('start_row', 2)
-        end_row = json_data.get('end_row')
-        
-        if not sheet_data or len(sheet_data) < 2:
-            raise HTTPException(status_code=400, detail="Sheet data must have at least 2 rows (headers + data)")
-        
-        # Google Sheets integration not yet implemented
-        raise HTTPException(status_code=501, detail="Google Sheets integration not yet implemented - use basic visitor endpoints")
-        
-        if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
-            raise HTTPException(status_code=500, detail="Missing credentials")
-            
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        # Process each row
-        results = []
-        errors = []
-        headers = sheet_data[0]
-        
-        # Determine processing range
-        last_row = end_row if end_row else len(sheet_data)
-        
-        for i in range(start_row - 1, min(last_row, len(sheet_data))):
-            row_number = i + 1
-            row_data = sheet_data[i]
-            
-            try:
-                # Convert sheet row to visitor data
-                visitor_data = sheets_processor.format_visitor_from_row(row_data, headers)
-                
-                # Validate required fields
-                if not visitor_data.get('first_name') or not visitor_data.get('last_name'):
-                    errors.append({
-                        'row': row_number,
-                        'error': 'Missing required fields: first_name, last_name'
-                    })
-                    continue
-                
-                # Create visitor using existing automation
-                result = await visitor_automation.create_update_visitor(visitor_data)
-                
-                results.append({
-                    'row': row_number,
-                    'visitor_name': f"{visitor_data['first_name']} {visitor_data['last_name']}",
-                    'success': True,
-                    'message': 'Visitor created successfully',
-                    'visitor_id': result.get('visitor_id')
-                })
-                
-                # Add delay to avoid overwhelming the system
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing row {row_number}: {e}")
-                errors.append({
-                    'row': row_number,
-                    'error': str(e)
-                })
-        
-        success_count = len(results)
-        failure_count = len(errors)
-        
-        return {
-            "success": True,
-            "processed": success_count + failure_count,
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "results": results,
-            "errors": errors
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to process visitors from sheets: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing browser: {e}")
+    # Not implemented yet, so answer before reading a possibly large body
+    raise HTTPException(status_code=501, detail="Google Sheets integration not yet implemented - use basic visitor endpoints")
 
 @app.post(
     "/sheets/visitors/update",
@@ -2145,114 +1344,10 @@ async def create_visitors_from_sheets(request: Request, auth_data: dict = Depend
         500: {"description": "Internal server error"},
     }
 )
-async def update_visitors_from_sheets(request: Request, auth_data: dict = Depends(verify_auth)):
+async def update_visitors_from_sheets(auth_data: dict = _auth_required):
     """Bulk update visitors from Google Sheets formatted data"""
-    driver = None
-    try:
-        # Get JSON data
-        json_data = await request.json()
-        sheet_data = json_data.get('sheet_data')
-        search_column = json_data.get('search_column', 'email')
-        start_row = json_data.get('start_row', 2)
-        end_row = json_data.get('end_row')
-        
-        if not sheet_data or len(sheet_data) < 2:
-            raise HTTPException(status_code=400, detail="Sheet data must have at least 2 rows (headers + data)")
-        
-        # Import the Google Sheets processor
-        # from integrations.google_sheets import GoogleSheetsProcessor
-        raise HTTPException(status_code=501, detail="Google Sheets bulk processing not yet implemented - use basic visitor endpoints")
-        sheets_processor = GoogleSheetsProcessor()
-        
-        # Validate sheet structure
-        validation_result = sheets_processor.validate_sheet_structure(sheet_data, [search_column])
-        if not validation_result['valid']:
-            raise HTTPException(status_code=400, detail=validation_result['error'])
-        
-        headers = sheet_data[0]
-        search_column_index = headers.index(search_column)
-        
-        if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
-            raise HTTPException(status_code=500, detail="Missing credentials")
-            
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        # Use the visitor update automation
-        from automation.visitor_create_update import VisitorCreateUpdateAutomation
-        visitor_automation = VisitorCreateUpdateAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
-        
-        # Process each row
-        results = []
-        errors = []
-        
-        # Determine processing range
-        last_row = end_row if end_row else len(sheet_data)
-        
-        for i in range(start_row - 1, min(last_row, len(sheet_data))):
-            row_number = i + 1
-            row_data = sheet_data[i]
-            
-            try:
-                # Get search term
-                search_term = row_data[search_column_index]
-                if not search_term:
-                    errors.append({
-                        'row': row_number,
-                        'error': f'No value in search column "{search_column}"'
-                    })
-                    continue
-                
-                # Convert sheet row to visitor data
-                visitor_data = sheets_processor.format_visitor_from_row(row_data, headers)
-                
-                # Update visitor
-                result = await visitor_automation.update_visitor_profile(search_term, visitor_data, {})
-                
-                results.append({
-                    'row': row_number,
-                    'search_term': search_term,
-                    'success': result['success'],
-                    'message': result['message'] if result['success'] else result.get('error'),
-                    'updated_fields': result.get('updated_fields', [])
-                })
-                
-                # Add delay
-                time.sleep(0.5)
-                
-            except Exception as e:
-                logger.error(f"Error processing row {row_number}: {e}")
-                errors.append({
-                    'row': row_number,
-                    'error': str(e)
-                })
-        
-        success_count = len([r for r in results if r['success']])
-        failure_count = len([r for r in results if not r['success']]) + len(errors)
-        
-        return {
-            "success": True,
-            "processed": len(results) + len(errors),
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "results": results,
-            "errors": errors
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to update visitors from sheets: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing browser: {e}")
+    # Not implemented yet, so answer before reading a possibly large body
+    raise HTTPException(status_code=501, detail="Google Sheets bulk processing not yet implemented - use basic visitor endpoints")
 
 @app.post(
     "/sheets/visitors/search",
@@ -2263,94 +1358,137 @@ async def update_visitors_from_sheets(request: Request, auth_data: dict = Depend
         200: {"description": "Search completed successfully"},
         400: {"description": "Invalid search terms"},
         401: {"description": "Authentication failed"},
+        413: {"description": "Too many search terms"},
         500: {"description": "Internal server error"},
+        503: {"description": "Every browser is busy; retry after the Retry-After delay"},
     }
 )
-async def search_visitors_for_sheets(request: Request, auth_data: dict = Depends(verify_auth)):
-    """Search for multiple visitors and return results in Google Sheets format"""
-    driver = None
+async def search_visitors_for_sheets(request: Request, stream: bool = False, auth_data: dict = _auth_required):
+    """
+    Search for multiple visitors and return results in Google Sheets format
+
+    Results are columnar: "headers" lists the column names and "columns" maps each of them
+    to its values, one per search term in request order. With ?stream=true the response is NDJSON instead: a {"headers": [...]} line, then one
+    {"index": i, "row": [...]} line per search term as soon as it is looked up (in completion
+    order), then a {"success": true, "searched": n} summary line.
+    """
     try:
         # Get JSON data
-        json_data = await request.json()
+        json_data = await read_json(request)
         search_terms = json_data.get('search_terms')
         
         if not search_terms or not isinstance(search_terms, list):
             raise HTTPException(status_code=400, detail="Search terms must be provided as an array")
         
+        if len(search_terms) > MAX_BULK_ROWS:
+            raise HTTPException(status_code=413, detail=f"{len(search_terms)} search terms exceeds MAX_BULK_ROWS={MAX_BULK_ROWS}")
+        
         if not EVTRACK_EMAIL or not EVTRACK_PASSWORD:
             raise HTTPException(status_code=500, detail="Missing credentials")
             
-        driver = start_driver(headless=HEADLESS_MODE)
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
+        def sheet_row(search_term, outcome):
+            if isinstance(outcome, Exception):
+                logger.error(f"Error searching for {search_term}: {outcome}")
+                return [
+                    search_term,
+                    'Error',
+                    '', '', '', '', '', '',
+                    str(outcome)
+                ]
+            if outcome:
+                visitor = outcome[0]  # Take first match
+                return [
+                    search_term,
+                    'Found',
+                    visitor.get('first_name', ''),
+                    visitor.get('last_name', ''),
+                    visitor.get('email', ''),
+                    visitor.get('mobile', ''),
+                    visitor.get('company', ''),
+                    visitor.get('visitor_id', ''),
+                    ''
+                ]
+            return [
+                search_term,
+                'Not Found',
+                '', '', '', '', '', '',
+                'No matches found'
+            ]
+        
+        async def search_chunk(offset, chunk, report):
+            # report(index, sheet_row) receives each term's row as soon as it is known
+            loop = asyncio.get_running_loop()
+            reported = set()
+            
+            def deliver(i, outcome):
+                reported.add(i)
+                report(offset + i, sheet_row(chunk[i], outcome))
+            
+            try:
+                async with driver_pool.checkout() as driver:
+                    from automation.login import EvTrackLogin
+                    login = EvTrackLogin(driver)
+                    await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+                    
+                    from automation.visitors import VisitorAutomation
+                    visitor_automation = VisitorAutomation(driver, websocket=app.state.batched_sender)
+                    
+                    # One list page load serves every term in the chunk; results are
+                    # reported from the Selenium worker thread, so hop back onto the loop
+                    await run_selenium(
+                        visitor_automation.get_visitor_summaries, chunk,
+                        lambda i, outcome: loop.call_soon_threadsafe(deliver, i, outcome)
+                    )
+            except Exception as e:
+                for i in range(len(chunk)):
+                    if i not in reported:
+                        deliver(i, e)
         
-        visitor_automation = VisitorAutomation(driver)
-        if hasattr(app.state, 'active_websocket'):
-            visitor_automation.set_websocket(app.state.active_websocket)
+        # Split the terms into one contiguous chunk per pooled driver so the chunks
+        # run side by side and the rows come back in order
+        chunk_size = -(-len(search_terms) // driver_pool.size)
+        chunks = [search_terms[i:i + chunk_size] for i in range(0, len(search_terms), chunk_size)]
         
         # Prepare results in sheet format
-        results = []
         headers = [
             'Search Term', 'Status', 'First Name', 'Last Name', 'Email', 
             'Phone', 'Company', 'Visitor ID', 'Error'
         ]
-        results.append(headers)
+        offsets = range(0, len(search_terms), chunk_size)
         
-        for search_term in search_terms:
-            try:
-                # Search for visitor
-                visitors = await visitor_automation.get_visitor_summary(search_term)
-                
-                if visitors and len(visitors) > 0:
-                    visitor = visitors[0]  # Take first match
-                    results.append([
-                        search_term,
-                        'Found',
-                        visitor.get('first_name', ''),
-                        visitor.get('last_name', ''),
-                        visitor.get('email', ''),
-                        visitor.get('mobile', ''),
-                        visitor.get('company', ''),
-                        visitor.get('visitor_id', ''),
-                        ''
-                    ])
-                else:
-                    results.append([
-                        search_term,
-                        'Not Found',
-                        '', '', '', '', '', '',
-                        'No matches found'
-                    ])
-                
-                # Small delay between searches
-                time.sleep(0.3)
-                
-            except Exception as e:
-                logger.error(f"Error searching for {search_term}: {e}")
-                results.append([
-                    search_term,
-                    'Error',
-                    '', '', '', '', '', '',
-                    str(e)
-                ])
+        if stream:
+            async def ndjson_rows():
+                queue = asyncio.Queue()
+                report = lambda index, row: queue.put_nowait((index, row))
+                searches = asyncio.gather(*(search_chunk(offset, chunk, report) for offset, chunk in zip(offsets, chunks)))
+                try:
+                    yield orjson.dumps({"headers": headers}) + b"\n"
+                    for _ in search_terms:
+                        index, row = await queue.get()
+                        yield orjson.dumps({"index": index, "row": row}) + b"\n"
+                    await searches
+                    yield orjson.dumps({"success": True, "searched": len(search_terms)}) + b"\n"
+                finally:
+                    # The client went away mid-stream: stop the searches so the drivers go back to the pool
+                    searches.cancel()
+            
+            return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
+        
+        rows = [None] * len(search_terms)
+        await asyncio.gather(*(search_chunk(offset, chunk, rows.__setitem__) for offset, chunk in zip(offsets, chunks)))
         
         return {
             "success": True,
             "searched": len(search_terms),
-            "results": results
+            "headers": headers,
+            "columns": dict(zip(headers, map(list, zip(*rows))))
         }
         
-    except HTTPException:
-        raise
+    except (HTTPException, DriverPoolTimeout):
+        raise  # Re-raise HTTP exceptions as-is; driver_pool_busy answers DriverPoolTimeout
     except Exception as e:
         logger.error(f"Failed to search visitors for sheets: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if driver:
-            try:
-                driver.quit()
-            except Exception as e:
-                logger.error(f"Error closing browser: {e}")
 
 # ===== GOOGLE DRIVE INTEGRATION ENDPOINTS =====
 
@@ -2366,70 +1504,10 @@ async def search_visitors_for_sheets(request: Request, auth_data: dict = Depends
         500: {"description": "Internal server error"},
     }
 )
-async def process_visitor_photos_from_drive(request: Request, auth_data: dict = Depends(verify_auth)):
+async def process_visitor_photos_from_drive(auth_data: dict = _auth_required):
     """Process visitor photos from Google Drive URLs"""
-    try:
-        # Get JSON data
-        json_data = await request.json()
-        drive_urls = json_data.get('drive_urls')
-        visitor_search_term = json_data.get('visitor_search_term')
-        
-        if not drive_urls or not isinstance(drive_urls, list):
-            raise HTTPException(status_code=400, detail="Drive URLs must be provided as an array")
-        
-        if not visitor_search_term:
-            raise HTTPException(status_code=400, detail="Visitor search term is required")
-        
-        # Google Drive integration not yet implemented
-        raise HTTPException(status_code=501, detail="Google Drive integration not yet implemented")
-        
-        # Process the URLs and validate files
-        results = []
-        errors = []
-        
-        for i, url in enumerate(drive_urls):
-            try:
-                # Extract file ID
-                file_id = drive_processor.extract_file_id_from_url(url)
-                if not file_id:
-                    errors.append({
-                        'url': url,
-                        'error': 'Invalid Google Drive URL format'
-                    })
-                    continue
-                
-                # Validate file (this would typically check file accessibility)
-                file_info = drive_processor.get_file_info(file_id, url)
-                
-                results.append({
-                    'url': url,
-                    'file_id': file_id,
-                    'file_name': file_info.get('name', f'photo_{i+1}'),
-                    'ready': True
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing Drive URL {url}: {e}")
-                errors.append({
-                    'url': url,
-                    'error': str(e)
-                })
-        
-        return {
-            "success": True,
-            "processed": len(drive_urls),
-            "ready_count": len(results),
-            "error_count": len(errors),
-            "photos": results,
-            "errors": errors,
-            "visitor_search_term": visitor_search_term
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to process Drive photos: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Not implemented yet, so answer before reading a possibly large body
+    raise HTTPException(status_code=501, detail="Google Drive integration not yet implemented")
 
 @app.post(
     "/drive/files/batch",
@@ -2443,96 +1521,10 @@ async def process_visitor_photos_from_drive(request: Request, auth_data: dict =
         500: {"description": "Internal server error"},
     }
 )
-async def batch_process_drive_files(request: Request, auth_data: dict = Depends(verify_auth)):
+async def batch_process_drive_files(auth_data: dict = _auth_required):
     """Batch process files from Google Drive URLs with visitor association"""
-    try:
-        # Get JSON data
-        json_data = await request.json()
-        sheet_data = json_data.get('sheet_data')
-        url_column = json_data.get('url_column', 'photo_url')
-        name_column = json_data.get('name_column', 'email')
-        start_row = json_data.get('start_row', 2)
-        
-        if not sheet_data or len(sheet_data) < 2:
-            raise HTTPException(status_code=400, detail="Sheet data must have at least 2 rows (headers + data)")
-        
-        # Google Drive integration not yet implemented  
-        raise HTTPException(status_code=501, detail="Google Drive integration not yet implemented")
-        
-        headers = sheet_data[0]
-        
-        # Find column indices
-        try:
-            url_column_index = headers.index(url_column)
-            name_column_index = headers.index(name_column)
-        except ValueError as e:
-            raise HTTPException(status_code=400, detail=f"Column not found: {e}")
-        
-        # Process each row
-        results = []
-        errors = []
-        
-        for i in range(start_row - 1, len(sheet_data)):
-            row_number = i + 1
-            row_data = sheet_data[i]
-            
-            try:
-                drive_url = row_data[url_column_index] if url_column_index < len(row_data) else ''
-                search_term = row_data[name_column_index] if name_column_index < len(row_data) else ''
-                
-                if not drive_url or not search_term:
-                    errors.append({
-                        'row': row_number,
-                        'error': 'Missing URL or search term'
-                    })
-                    continue
-                
-                # Extract file ID and validate
-                file_id = drive_processor.extract_file_id_from_url(drive_url)
-                if not file_id:
-                    errors.append({
-                        'row': row_number,
-                        'error': 'Invalid Google Drive URL format'
-                    })
-                    continue
-                
-                # Get file info
-                file_info = drive_processor.get_file_info(file_id, drive_url)
-                
-                results.append({
-                    'row': row_number,
-                    'search_term': search_term,
-                    'drive_url': drive_url,
-                    'file_id': file_id,
-                    'success': True,
-                    'message': 'File processed and ready',
-                    'file_name': file_info.get('name', 'unknown')
-                })
-                
-            except Exception as e:
-                logger.error(f"Error processing row {row_number}: {e}")
-                errors.append({
-                    'row': row_number,
-                    'error': str(e)
-                })
-        
-        success_count = len(results)
-        failure_count = len(errors)
-        
-        return {
-            "success": True,
-            "processed": success_count + failure_count,
-            "success_count": success_count,
-            "failure_count": failure_count,
-            "results": results,
-            "errors": errors
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Failed to batch process Drive files: {e}")
-        raise HTTPException(status_code=500, detail=str(e))
+    # Not implemented yet, so answer before reading a possibly large body
+    raise HTTPException(status_code=501, detail="Google Drive integration not yet implemented")
 async def google_oauth_callback(auth_code: str, redirect_uri: str):
     """Handle Google OAuth callback"""
     try:
@@ -2549,7 +1541,7 @@ async def google_oauth_callback(auth_code: str, redirect_uri: str):
     summary="Verify authentication token",
     description="Verify and return information about the current authentication token"
 )
-async def verify_authentication(auth_data: dict = Depends(verify_auth)):
+async def verify_authentication(auth_data: dict = _auth_required):
     """Verify current authentication"""
     return {
         "authenticated": True,
@@ -2572,11 +1564,16 @@ async def health_check():
         "version": "2.0.0",
         "timestamp": time.time(),
         "authentication": {
-            "cognito_configured": bool(os.getenv('COGNITO_USER_POOL_ID')),
-            "google_oauth_configured": bool(os.getenv('GOOGLE_CLIENT_ID')),
+            "cognito_configured": bool(COGNITO_USER_POOL_ID),
+            "google_oauth_configured": bool(GOOGLE_CLIENT_ID),
             "api_keys_configured": bool(VALID_API_KEYS)
         },
         "evtrack_configured": bool(EVTRACK_EMAIL and EVTRACK_PASSWORD),
+        "driver_pool": {
+            "size": driver_pool.size,
+            "in_use": driver_pool.in_use,
+            "waiting": driver_pool.waiting
+        },
         "endpoints": {
             "visitors": "/visitors",
             "sheets_integration": "/sheets/visitors/create",
@@ -2585,18 +1582,13 @@ async def health_check():
         }
     }
 
-@app.get("/favicon.ico")
-async def favicon():
-    """Return favicon to prevent 404 errors in browser"""
-    return {"message": "EVTrack API"}
-
 @app.post(
     "/auth/verify",
     tags=["authentication"],
     summary="Verify authentication",
     description="Verify current authentication status and return user info"
 )
-async def verify_authentication(auth_data: dict = Depends(verify_auth)):
+async def verify_authentication(auth_data: dict = _auth_required):
     """Verify authentication for Google Apps Script"""
     return {
         "authenticated": True,
@@ -2612,12 +1604,13 @@ async def verify_authentication(auth_data: dict = Depends(verify_auth)):
     "/sheets/visitors/create",
     tags=["google-integration"],
     summary="Create visitor from Google Sheets data",
-    description="Create a new visitor in EVTrack from Google Sheets row data"
+    description="Create a new visitor in EVTrack from Google Sheets row data",
+    responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}}
 )
-async def create_visitor_from_sheets(request: Request, auth_data: dict = Depends(verify_auth)):
+async def create_visitor_from_sheets(request: Request, auth_data: dict = _auth_required):
     """Create visitor from Google Sheets data"""
     try:
-        json_data = await request.json()
+        json_data = await read_json(request)
         
         # Extract visitor data from sheets format
         visitor_data = {
@@ -2631,80 +1624,69 @@ async def create_visitor_from_sheets(request: Request, auth_data: dict = Depends
         }
         
         # Use existing visitor creation logic
-        driver = get_driver()
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        visitor_automation = VisitorAutomation(driver)
-        result = await visitor_automation.create_update_visitor(visitor_data)
-        
-        return {
-            "success": True,
-            "visitor_id": result.get("visitor_id"),
-            "message": "Visitor created from Google Sheets data",
-            "source": "google_sheets"
-        }
-        
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            from automation.visitors import VisitorAutomation
+            visitor_automation = VisitorAutomation(driver)
+            result = await run_selenium(visitor_automation.create_update_visitor, visitor_data)
+            
+            return {
+                "success": True,
+                "visitor_id": result.get("visitor_id"),
+                "message": "Visitor created from Google Sheets data",
+                "source": "google_sheets"
+            }
+            
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Failed to create visitor from sheets: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'driver' in locals():
-            driver.quit()
 
 @app.post(
     "/sheets/visitors/update",
     tags=["google-integration"],
     summary="Update visitor from Google Sheets data",
-    description="Update existing visitor in EVTrack from Google Sheets row data"
+    description="Update existing visitor in EVTrack from Google Sheets row data",
+    responses={503: {"description": "Every browser is busy; retry after the Retry-After delay"}}
 )
-async def update_visitor_from_sheets(request: Request, auth_data: dict = Depends(verify_auth)):
+async def update_visitor_from_sheets(request: Request, auth_data: dict = _auth_required):
     """Update visitor from Google Sheets data"""
     try:
-        json_data = await request.json()
+        json_data = await read_json(request)
         
         search_term = json_data.get('searchTerm')
         if not search_term:
             raise HTTPException(status_code=400, detail="searchTerm is required")
         
         # Extract visitor data from sheets format
-        visitor_data = {}
-        field_mapping = {
-            'firstName': 'first_name',
-            'lastName': 'last_name',
-            'email': 'email',
-            'mobile': 'mobile',
-            'company': 'company',
-            'reasonForVisit': 'reason_for_visit',
-            'comments': 'comments'
-        }
-        
-        for sheets_field, evtrack_field in field_mapping.items():
-            if sheets_field in json_data and json_data[sheets_field]:
-                visitor_data[evtrack_field] = json_data[sheets_field]
+        visitor_data = {evtrack_field: json_data[sheets_field] for sheets_field, evtrack_field in SHEETS_TO_EVTRACK_FIELDS if json_data.get(sheets_field)}
         
         # Use existing visitor update logic
-        driver = get_driver()
-        login = EvTrackLogin(driver)
-        await login.login(EVTRACK_EMAIL, EVTRACK_PASSWORD)
-        
-        from automation.visitor_create_update import VisitorCreateUpdateAutomation
-        visitor_automation = VisitorCreateUpdateAutomation(driver)
-        result = await visitor_automation.update_visitor_profile(search_term, visitor_data, {})
-        
-        return {
-            "success": True,
-            "message": result['message'],
-            "updated_fields": result['updated_fields'],
-            "source": "google_sheets"
-        }
-        
+        async with driver_pool.checkout() as driver:
+            from automation.login import EvTrackLogin
+            from automation.visitor_create_update import VisitorCreateUpdateAutomation
+            login = EvTrackLogin(driver)
+            await run_selenium(login.login, EVTRACK_EMAIL, EVTRACK_PASSWORD)
+            
+            visitor_automation = VisitorCreateUpdateAutomation(driver)
+            result = await run_selenium(visitor_automation.update_visitor_profile, search_term, visitor_data, {})
+            
+            return {
+                "success": True,
+                "message": result['message'],
+                "updated_fields": result['updated_fields'],
+                "source": "google_sheets"
+            }
+            
+    except DriverPoolTimeout:
+        raise  # driver_pool_busy answers it with 503
     except Exception as e:
         logger.error(f"Failed to update visitor from sheets: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if 'driver' in locals():
-            driver.quit()
 
 # Google Drive Integration Endpoints
 @app.post(
@@ -2713,10 +1695,10 @@ async def update_visitor_from_sheets(request: Request, auth_data: dict = Depends
     summary="Process photos from Google Drive",
     description="Process visitor photos stored in Google Drive and attach to EVTrack profile"
 )
-async def process_drive_photos(request: Request, auth_data: dict = Depends(verify_auth)):
+async def process_drive_photos(request: Request, auth_data: dict = _auth_required):
     """Process photos from Google Drive for visitor profiles"""
     try:
-        json_data = await request.json()
+        json_data = await read_json(request)
         
         visitor_search = json_data.get('visitorSearch')
         drive_photo_url = json_data.get('drivePhotoUrl')
@@ -2749,7 +1731,7 @@ async def process_drive_photos(request: Request, auth_data: dict = Depends(verif
     summary="Get Google Sheets template",
     description="Get the recommended column structure for Google Sheets integration"
 )
-async def get_sheets_template(auth_data: dict = Depends(verify_auth)):
+async def get_sheets_template(auth_data: dict = _auth_required):
     """Get Google Sheets template structure for EVTrack integration"""
     return {
         "template": {
@@ -1,57 +1,240 @@
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
-from utils.selenium_utils import wait_for_element, click_element, fill_text_field
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from utils.selenium_utils import WAIT_POLL_FREQUENCY, no_implicit_wait, wait_for_element, click_element, fill_text_field
 from models.visitor import CredentialData
+import functools
+import re
 import time
 
+# Canonical 8-4-4-4-12 hex UUID; search terms matching it open the visitor directly
+UUID_RE = re.compile(r'\A[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z', re.IGNORECASE)
+
+# Fills the credential form in one WebDriver call. arguments[0] is a list of [id or name, value]
+# pairs set in order (selects only accept one of their options); arguments[1] is the wanted
+# Access Control List checkbox state or null. Returns the keys that couldn't be set, including
+# fields whose node was replaced (the form re-rendered) while the rest were being filled.
+FILL_CREDENTIAL_FORM_JS = """
+var missing = [], filled = [];
+function lookup(key) {
+    return document.getElementById(key) || document.getElementsByName(key)[0];
+}
+arguments[0].forEach(function (pair) {
+    var key = pair[0], value = pair[1];
+    var field = lookup(key);
+    if (!field || (field.tagName === 'SELECT' &&
+            !Array.prototype.some.call(field.options, function (option) { return option.value === value; }))) {
+        missing.push(key);
+        return;
+    }
+    field.value = value;
+    field.dispatchEvent(new Event('input', {bubbles: true}));
+    field.dispatchEvent(new Event('change', {bubbles: true}));
+    filled.push([key, field]);
+});
+filled.forEach(function (entry) {
+    if (lookup(entry[0]) !== entry[1]) missing.push(entry[0]);
+});
+if (arguments[1] !== null) {
+    var checkbox = document.getElementById('accessControlListsIntegerArray1');
+    if (!checkbox) {
+        missing.push('accessControlListsIntegerArray1');
+    } else if (checkbox.checked !== arguments[1]) {
+        checkbox.click();
+    }
+}
+return missing;
+"""
+
+# Returns [element, index] for the first of the CSS selectors in arguments[0] that matches, or null
+FIRST_MATCH_JS = """
+for (var i = 0; i < arguments[0].length; i++) {
+    var element = document.querySelector(arguments[0][i]);
+    if (element) return [element, i];
+}
+return null;
+"""
+
+# Sets arguments[0]'s value to arguments[1] the way typing would (input + change events) and
+# reports whether it stuck, so the fill and its check cost one WebDriver call.
+SET_FIELD_VALUE_JS = """
+var field = arguments[0];
+field.focus();
+field.value = arguments[1];
+field.dispatchEvent(new Event('input', {bubbles: true}));
+field.dispatchEvent(new Event('change', {bubbles: true}));
+return field.value === arguments[1];
+"""
+
+# Selects reader type arguments[0]. Returns null when the select or that option is missing,
+# otherwise [whether the value changed, the PIN field as it was before the change (or null)]
+# so the caller can wait for the form to re-render before filling the dependent fields.
+SET_READER_TYPE_JS = """
+var value = arguments[0];
+var field = document.getElementById('readerType') || document.getElementsByName('readerType')[0];
+if (!field || !Array.prototype.some.call(field.options, function (option) { return option.value === value; })) {
+    return null;
+}
+var pin = document.getElementById('pin') || document.getElementsByName('pin')[0] || null;
+if (field.value === value) return [false, pin];
+field.value = value;
+field.dispatchEvent(new Event('input', {bubbles: true}));
+field.dispatchEvent(new Event('change', {bubbles: true}));
+return [true, pin];
+"""
+
+# Reads the visitor UUID off the first search result link in one call. arguments[0] is the list
+# of link selectors tried in order; returns the UUID, '' when the link has no uuid= in its href,
+# or null when no result link is found.
+RESULT_UUID_JS = """
+for (var i = 0; i < arguments[0].length; i++) {
+    var link = document.querySelector(arguments[0][i]);
+    if (link) {
+        var match = (link.getAttribute('href') || '').match(/uuid=([^&#]+)/);
+        return match ? match[1] : '';
+    }
+}
+return null;
+"""
+
+def _without_implicit_wait(method):
+    """Run a CredentialAutomation method with the implicit wait off; every lookup in it is an explicit wait or a probe"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with no_implicit_wait(self.driver):
+            return method(self, *args, **kwargs)
+    return wrapper
+
 class CredentialAutomation:
+    # Visitor list search box selectors, tried in order
+    SEARCH_SELECTORS = (
+        'input[type="search"]',
+        '.search-input',
+        '#search',
+        'input[placeholder*="search" i]',
+        'input[name*="search" i]',
+        '.dataTables_filter input',
+        'input[aria-label*="search" i]'
+    )
+    # Selector that found the search box last time; shared because every driver sees the same EVTrack pages
+    _resolved_search_selector = None
+
     def __init__(self, driver):
         self.driver = driver
+        # Shared by the 10s page-transition waits below
+        self._wait = WebDriverWait(driver, 10, poll_frequency=WAIT_POLL_FREQUENCY,
+                                   ignored_exceptions=(StaleElementReferenceException,))
         
+    def _js_first_match(self, selectors):
+        """Find the first selector that matches with one browser call; returns (element, selector) or None"""
+        selectors = list(selectors)
+        match = self.driver.execute_script(FIRST_MATCH_JS, selectors)
+        return (match[0], selectors[match[1]]) if match else None
+        
+    def _js_first(self, selectors):
+        """Find the first element matching any of the selectors with one browser call instead of one per selector"""
+        match = self._js_first_match(selectors)
+        return match[0] if match else None
+        
+    def _js_click(self, element):
+        """Click through JavaScript: one round-trip, no scrolling into view and no intercepted-click errors"""
+        self.driver.execute_script("arguments[0].click();", element)
+        
+    def _fill_retrying_stale(self, find, value, attempts=3):
+        """
+        Set a value on the element returned by find(), looking it up again if the form
+        re-renders underneath (e.g. after the reader type changes) instead of failing the save
+        
+        The value is set and checked in one script; real typing is only the fallback for
+        fields whose scripts reject a programmatic value.
+        
+        Returns:
+            bool: True once the field holds exactly the value
+        """
+        for _ in range(attempts):
+            try:
+                field = find()
+                if not field:
+                    return False
+                if self.driver.execute_script(SET_FIELD_VALUE_JS, field, value):
+                    return True
+                print(" WARNING: Value mismatch! Typing it instead...")
+                field.clear()
+                field.send_keys(value)
+                if field.get_attribute('value') == value:
+                    return True
+            except StaleElementReferenceException:
+                print(" Field went stale, looking it up again...")
+        return False
+        
+    def _ensure_credentials_tab(self):
+        """Show the Credentials tab, only clicking it when the page didn't already open on it (#credentials)"""
+        # wait_for_element raises rather than returning None, so fallbacks go in the same selector
+        credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"][data-toggle="tab"], a[href="#credentials"]', timeout=10)
+        if not credentials_tab:
+            return False
+        
+        if not self.driver.execute_script(
+                "var pane = document.querySelector('#credentials'); return !!pane && pane.classList.contains('active');"):
+            self._js_click(credentials_tab)
+        
+        try:
+            self._wait.until(
+                EC.visibility_of_element_located((By.CSS_SELECTOR, 'button.dt-button.btn.btn-primary')))
+        except TimeoutException:
+            pass  # Reported by the caller when the Add button can't be found
+        return True
+        
+    @_without_implicit_wait
     def search_and_navigate_to_visitor(self, search_term: str):
         """Search for a visitor and navigate to their profile page - same pattern as invitation and vehicles"""
         try:
             # Navigate directly to visitor list (skip dashboard)
             self.driver.get('https://app.evtrack.com/visitor/list')
-            time.sleep(3)
-            
-            # Find search bar and enter search term
-            search_input = None
-            search_selectors = [
-                'input[type="search"]',
-                '.search-input',
-                '#search',
-                'input[placeholder*="search" i]',
-                'input[name*="search" i]',
-                '.dataTables_filter input',
-                'input[aria-label*="search" i]'
-            ]
-            
-            for selector in search_selectors:
-                try:
-                    search_input = wait_for_element(self.driver, By.CSS_SELECTOR, selector, timeout=3)
-                    if search_input:
-                        break
-                except:
-                    continue
+            # Wait for the visitor table instead of a fixed pause
+            self._wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, '.dataTables_wrapper, .dataTables_filter input'))
+            )
+            
+            # Find search bar and enter search term, trying the last working selector first.
+            # All selectors are probed in one browser call, polled briefly in case the
+            # search box renders just after the table
+            resolved = CredentialAutomation._resolved_search_selector
+            search_selectors = [resolved] if resolved else []
+            search_selectors += [selector for selector in self.SEARCH_SELECTORS if selector != resolved]
+            
+            try:
+                search_input, selector = WebDriverWait(self.driver, 2, poll_frequency=WAIT_POLL_FREQUENCY).until(
+                    lambda d: self._js_first_match(search_selectors))
+                CredentialAutomation._resolved_search_selector = selector
+            except TimeoutException:
+                search_input = None
             
             if not search_input:
                 print("Could not find search input")
                 return None
                 
-            # Clear and search
+            # Clear and search; the table info line ("Showing ... (filtered from ...)") changes
+            # once the filter has been applied
+            info_text = self.driver.execute_script(
+                "var info = document.querySelector('.dataTables_info'); return info ? info.textContent : null;")
             search_input.clear()
             search_input.send_keys(search_term)
-            time.sleep(2)
             
             # Press Enter
             from selenium.webdriver.common.keys import Keys
             search_input.send_keys(Keys.ENTER)
-            time.sleep(3)
+            if info_text is not None:
+                try:
+                    WebDriverWait(self.driver, 5, poll_frequency=WAIT_POLL_FREQUENCY).until(lambda d: d.execute_script(
+                        "var info = document.querySelector('.dataTables_info'); return info && info.textContent;") != info_text)
+                except TimeoutException:
+                    pass  # Same row count as before the search (e.g. a single-visitor list)
+            else:
+                time.sleep(3)
             
-            # Find and click the first visitor result
-            visitor_link = None
-            visitor_uuid = None
+            # Read the first visitor result's UUID in the browser
             
             link_selectors = [
                 'tbody tr td a',
@@ -63,34 +246,26 @@ class CredentialAutomation:
                 'tbody tr:first-child td:first-child a'
             ]
             
-            for selector in link_selectors:
-                try:
-                    links = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if links:
-                        visitor_link = links[0]
-                        href = visitor_link.get_attribute('href')
-                        
-                        # Extract UUID immediately if possible
-                        if 'uuid=' in href:
-                            visitor_uuid = href.split('uuid=')[1].split('&')[0]
-                        
-                        break
-                except Exception as e:
-                    continue
-            
-            if not visitor_link:
+            visitor_uuid = self.driver.execute_script(RESULT_UUID_JS, link_selectors)
+            if visitor_uuid is None:
                 print(f"Could not find visitor with search term: {search_term}")
                 return None
-                
-            # Click to go to visitor profile
-            visitor_link.click()
-            time.sleep(3)
             
-            # If we didn't get UUID from href, get it from current URL
-            if not visitor_uuid:
+            if visitor_uuid:
+                # Load the profile straight away, opened on the Credentials tab, rather than
+                # clicking the link and waiting for the navigation
+                self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={visitor_uuid}#credentials')
+            else:
+                # The link doesn't carry the UUID; follow it and read it from the profile URL
+                self._js_click(self._js_first(link_selectors))
+                try:
+                    self._wait.until(EC.url_contains('uuid='))
+                except TimeoutException:
+                    pass
+                
                 current_url = self.driver.current_url
                 if 'uuid=' in current_url:
-                    visitor_uuid = current_url.split('uuid=')[1].split('&')[0]
+                    visitor_uuid = current_url.split('uuid=')[1].split('&')[0].split('#')[0]
             
             print(f"Navigated to visitor profile, UUID: {visitor_uuid}")
             return visitor_uuid
@@ -99,6 +274,7 @@ class CredentialAutomation:
             print(f"Error searching for visitor: {e}")
             return None
         
+    @_without_implicit_wait
     def search_visitor_for_credentials(self, search_term: str):
         """Legacy method - searches and returns UUID and URL"""
         uuid = self.search_and_navigate_to_visitor(search_term)
@@ -106,6 +282,7 @@ class CredentialAutomation:
             return uuid, self.driver.current_url
         return None, None
 
+    @_without_implicit_wait
     def add_credential_to_visitor(self, credential_data: CredentialData):
         """Add a credential to the currently loaded visitor profile - follows exact HTML structure"""
         try:
@@ -119,21 +296,7 @@ class CredentialAutomation:
             # Step 1: Click on Credentials tab
             print("Step 1: Clicking Credentials tab...")
             
-            credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"][data-toggle="tab"]', timeout=10)
-            if not credentials_tab:
-                credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"]', timeout=5)
-            
-            if credentials_tab:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", credentials_tab)
-                time.sleep(1)
-                
-                try:
-                    credentials_tab.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", credentials_tab)
-                
-                time.sleep(2)
-                
+            if self._ensure_credentials_tab():
                 # Check if we're still on the same page
                 if 'visitor/edit' not in self.driver.current_url:
                     print(f"ERROR: After clicking credentials tab, we're no longer on visitor edit page!")
@@ -149,15 +312,13 @@ class CredentialAutomation:
             
             add_btn = wait_for_element(self.driver, By.CSS_SELECTOR, 'button.dt-button.btn.btn-primary', timeout=10)
             if add_btn:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", add_btn)
-                time.sleep(1)
+                self._js_click(add_btn)
                 
                 try:
-                    add_btn.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", add_btn)
-                
-                time.sleep(3)
+                    self._wait.until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[name="readerType"], button[type="submit"][value="save"]')))
+                except TimeoutException:
+                    pass  # The URL check below and the form lookups report what went wrong
                 
                 # Check if we're still on the same page or properly redirected to add form
                 current_url = self.driver.current_url
@@ -173,173 +334,82 @@ class CredentialAutomation:
             # Step 3: Fill in the credential form
             print("Step 3: Filling credential form...")
             
-            # Reader Type
+            # The reader type goes in first, on its own: changing it re-renders the fields that
+            # depend on it, so wait for the old PIN field to be replaced (or a PIN field to appear)
+            # before filling the rest
             if credential_data.reader_type:
-                reader_type_field = wait_for_element(self.driver, By.NAME, 'readerType', timeout=10)
-                if reader_type_field:
-                    select = Select(reader_type_field)
-                    select.select_by_value(credential_data.reader_type)
-                    print(f"Selected Reader Type: {credential_data.reader_type}")
-                else:
-                    print("Could not find Reader Type field")
+                reader_type = self.driver.execute_script(SET_READER_TYPE_JS, str(credential_data.reader_type))
+                if reader_type is None:
+                    print(f"ERROR: Could not set reader type: {credential_data.reader_type}")
+                    return False
+                changed, old_pin = reader_type
+                if changed and (old_pin or credential_data.pin):
+                    settled = EC.staleness_of(old_pin) if old_pin else (lambda d: self._js_first(['#pin', '[name="pin"]']))
+                    try:
+                        WebDriverWait(self.driver, 2, poll_frequency=WAIT_POLL_FREQUENCY).until(settled)
+                    except TimeoutException:
+                        pass  # This reader type doesn't re-render the form; missing fields are reported below
+            
+            # Everything else except Card#/LPR/UID goes in with one script
+            form_values = [(key, str(value)) for key, value in (
+                ('pin', credential_data.pin),
+                ('activeDatePlaceholder', credential_data.active_date),
+                ('activeTimePlaceholder', credential_data.active_time),
+                ('expiryDatePlaceholder', credential_data.expiry_date),
+                ('expiryTimePlaceholder', credential_data.expiry_time),
+                ('useLimit', credential_data.use_limit),
+                ('comments', credential_data.comments),
+                ('status', credential_data.status)
+            ) if value]
+            missing = self.driver.execute_script(FILL_CREDENTIAL_FORM_JS, form_values, credential_data.access_control_lists)
+            if missing:
+                print(f"ERROR: Could not fill credential form fields: {', '.join(missing)}")
+                return False
+            print(f"Filled credential form fields: {', '.join(key for key, _ in form_values)}")
             
             # Card#/LPR/UID (REQUIRED FIELD)
             if credential_data.unique_identifier:
-                unique_id_field = None
                 unique_id_selectors = [
                     'uniqueIdentifier', 'cardNumber', 'card_number', 'lpr', 'uid', 'credentialId', 'credential_id'
                 ]
                 
-                # Try ID selectors first
-                for selector in unique_id_selectors:
+                # IDs first, then names, then inputs whose placeholder mentions the field;
+                # all probed in the browser, polling until the field renders
+                probe_selectors = [f'#{name}' for name in unique_id_selectors]
+                probe_selectors += [f'[name="{name}"]' for name in unique_id_selectors]
+                probe_selectors += [
+                    'input[placeholder*="Card" i]',
+                    'input[placeholder*="LPR" i]', 
+                    'input[placeholder*="UID" i]',
+                    'input[placeholder*="Unique" i]',
+                    'input[placeholder*="Identifier" i]'
+                ]
+                def find_unique_id_field():
                     try:
-                        unique_id_field = wait_for_element(self.driver, By.ID, selector, timeout=3)
-                        if unique_id_field:
-                            break
-                    except:
-                        continue
-                
-                # If not found by ID, try by name attribute
-                if not unique_id_field:
-                    for selector in unique_id_selectors:
-                        try:
-                            unique_id_field = wait_for_element(self.driver, By.NAME, selector, timeout=3)
-                            if unique_id_field:
-                                break
-                        except:
-                            continue
+                        return WebDriverWait(self.driver, 5, poll_frequency=WAIT_POLL_FREQUENCY).until(lambda d: self._js_first(probe_selectors))
+                    except TimeoutException:
+                        return None
                 
-                # If still not found, try CSS selectors for input fields with placeholder text
-                if not unique_id_field:
-                    css_selectors = [
-                        'input[placeholder*="Card" i]',
-                        'input[placeholder*="LPR" i]', 
-                        'input[placeholder*="UID" i]',
-                        'input[placeholder*="Unique" i]',
-                        'input[placeholder*="Identifier" i]'
-                    ]
-                    
-                    for selector in css_selectors:
-                        try:
-                            unique_id_field = wait_for_element(self.driver, By.CSS_SELECTOR, selector, timeout=3)
-                            if unique_id_field:
-                                break
-                        except:
-                            continue
-                
-                if unique_id_field:
-                    unique_id_field.clear()
-                    time.sleep(0.5)
-                    unique_id_field.send_keys(credential_data.unique_identifier)
-                    time.sleep(0.5)
-                    
-                    # Verify the value was entered
-                    entered_value = unique_id_field.get_attribute('value')
-                    
-                    if entered_value == credential_data.unique_identifier:
-                        print(f" Successfully filled Card#/LPR/UID: {credential_data.unique_identifier}")
-                    else:
-                        print(f" WARNING: Value mismatch! Retrying...")
-                        unique_id_field.click()
-                        time.sleep(0.5)
-                        unique_id_field.clear()
-                        time.sleep(0.5)
-                        unique_id_field.send_keys(credential_data.unique_identifier)
-                        time.sleep(0.5)
-                        
-                        entered_value = unique_id_field.get_attribute('value')
-                        if entered_value != credential_data.unique_identifier:
-                            print(f"ERROR: Still unable to fill field correctly after retry!")
-                            return False
+                if self._fill_retrying_stale(find_unique_id_field, credential_data.unique_identifier):
+                    print(f" Successfully filled Card#/LPR/UID: {credential_data.unique_identifier}")
                 else:
-                    print("ERROR: Could not find Card#/LPR/UID field")
+                    print("ERROR: Could not fill Card#/LPR/UID field")
                     return False
             else:
                 print("ERROR: No unique_identifier provided! This is a required field.")
                 return False
             
-            # PIN
-            if credential_data.pin:
-                pin_field = wait_for_element(self.driver, By.NAME, 'pin', timeout=5)
-                if pin_field:
-                    pin_field.clear()
-                    pin_field.send_keys(str(credential_data.pin))
-                    print(f"Filled PIN: {credential_data.pin}")
-            
-            # Active Date and Time
-            if credential_data.active_date:
-                active_date_field = wait_for_element(self.driver, By.ID, 'activeDatePlaceholder', timeout=5)
-                if active_date_field:
-                    active_date_field.clear()
-                    active_date_field.send_keys(credential_data.active_date)
-                    print(f"Filled Active Date: {credential_data.active_date}")
-            
-            if credential_data.active_time:
-                active_time_field = wait_for_element(self.driver, By.ID, 'activeTimePlaceholder', timeout=5)
-                if active_time_field:
-                    active_time_field.clear()
-                    active_time_field.send_keys(credential_data.active_time)
-                    print(f"Filled Active Time: {credential_data.active_time}")
-            
-            # Expiry Date and Time
-            if credential_data.expiry_date:
-                expiry_date_field = wait_for_element(self.driver, By.ID, 'expiryDatePlaceholder', timeout=5)
-                if expiry_date_field:
-                    expiry_date_field.clear()
-                    expiry_date_field.send_keys(credential_data.expiry_date)
-                    print(f"Filled Expiry Date: {credential_data.expiry_date}")
-            
-            if credential_data.expiry_time:
-                expiry_time_field = wait_for_element(self.driver, By.ID, 'expiryTimePlaceholder', timeout=5)
-                if expiry_time_field:
-                    expiry_time_field.clear()
-                    expiry_time_field.send_keys(credential_data.expiry_time)
-                    print(f"Filled Expiry Time: {credential_data.expiry_time}")
-            
-            # Use Limit
-            if credential_data.use_limit:
-                use_limit_field = wait_for_element(self.driver, By.NAME, 'useLimit', timeout=5)
-                if use_limit_field:
-                    use_limit_field.clear()
-                    use_limit_field.send_keys(str(credential_data.use_limit))
-                    print(f"Filled Use Limit: {credential_data.use_limit}")
-            
-            # Comments
-            if credential_data.comments:
-                comments_field = wait_for_element(self.driver, By.NAME, 'comments', timeout=5)
-                if comments_field:
-                    comments_field.clear()
-                    comments_field.send_keys(credential_data.comments)
-                    print(f"Filled Comments: {credential_data.comments}")
-            
-            # Status
-            if credential_data.status:
-                status_field = wait_for_element(self.driver, By.NAME, 'status', timeout=5)
-                if status_field:
-                    select = Select(status_field)
-                    select.select_by_value(credential_data.status)
-                    print(f"Selected Status: {credential_data.status}")
-            
-            # Access Control List checkbox
-            if hasattr(credential_data, 'access_control_lists') and credential_data.access_control_lists is not None:
-                checkbox = wait_for_element(self.driver, By.ID, 'accessControlListsIntegerArray1', timeout=5)
-                if checkbox:
-                    if credential_data.access_control_lists and not checkbox.is_selected():
-                        checkbox.click()
-                        print("Checked Access Control List")
-                    elif not credential_data.access_control_lists and checkbox.is_selected():
-                        checkbox.click()
-                        print("Unchecked Access Control List")
-            
             # Step 4: Click Save button
             print("Step 4: Clicking Save button...")
-            save_btn = wait_for_element(self.driver, By.CSS_SELECTOR, 'button[type="submit"][value="save"]', timeout=10)
-            if not save_btn:
-                save_btn = wait_for_element(self.driver, By.CSS_SELECTOR, 'button[name="action"][value="save"]', timeout=5)
+            save_btn = wait_for_element(self.driver, By.CSS_SELECTOR, 'button[type="submit"][value="save"], button[name="action"][value="save"]', timeout=10)
                 
             if save_btn:
-                save_btn.click()
-                time.sleep(4)
+                self._js_click(save_btn)
+                # Submitting navigates away, which detaches the old Save button
+                try:
+                    self._wait.until(EC.staleness_of(save_btn))
+                except TimeoutException:
+                    pass
                 print("Successfully clicked Save button")
                 
                 current_url = self.driver.current_url
@@ -357,16 +427,17 @@ class CredentialAutomation:
             print(f"Error adding credential to visitor: {e}")
             return False
 
+    @_without_implicit_wait
     def add_credential(self, search_term: str, credential_data: CredentialData):
         """Main method: Search for visitor and add credential"""
         try:
             # Check if search_term is a UUID (format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx)
-            is_uuid = len(search_term) == 36 and search_term.count('-') == 4
+            is_uuid = bool(UUID_RE.match(search_term))
             
-            # If search_term is a UUID, navigate directly to that visitor
+            # If search_term is a UUID, open that visitor straight on the Credentials tab;
+            # add_credential_to_visitor waits for the tab, so no fixed sleep is needed here
             if is_uuid:
-                self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={search_term}')
-                time.sleep(3)
+                self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={search_term}#credentials')
                 visitor_uuid = search_term
             else:
                 # If search_term is a name, need to search
@@ -390,273 +461,26 @@ class CredentialAutomation:
             return False
 
     # Keep original method for backward compatibility
+    @_without_implicit_wait
     def add_credential_legacy(self, visitor_uuid: str, credential_data: CredentialData):
         """Legacy method: Add a credential to a visitor's profile using UUID"""
         try:
-            # Navigate to visitor edit page with UUID
-            self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={visitor_uuid}')
-            time.sleep(4)
-            
-            # Click on Credentials tab
-            credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"]', timeout=10)
-            if not credentials_tab:
-                # Try alternative selectors for credentials tab
-                tab_selectors = [
-                    '.nav-tabs a[data-toggle="tab"][href="#credentials"]',
-                    '//a[contains(@href, "#credentials") or contains(text(), "Credentials")]',
-                    'li a[href="#credentials"]',
-                    '.nav-link[href="#credentials"]'
-                ]
-                for selector in tab_selectors:
-                    try:
-                        if selector.startswith('//'):
-                            credentials_tab = self.driver.find_element(By.XPATH, selector)
-                        else:
-                            credentials_tab = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if credentials_tab:
-                            break
-                    except:
-                        continue
-            
-            if credentials_tab:
-                credentials_tab.click()
-                time.sleep(3)
-                
-                # Click "Add" button for credentials
-                print("Looking for Add credential button...")
-                add_btn = None
-                
-                # Wait a bit for the tab content to fully load
-                time.sleep(2)
-                
-                # Try different approaches to find and click the Add button
-                add_btn_selectors = [
-                    'button.dt-button.btn.btn-primary',
-                    'button[type="button"].btn.btn-primary',
-                    '.dt-buttons button.btn-primary',
-                    'button:contains("Add")',
-                    '.btn-primary'
-                ]
-                
-                for selector in add_btn_selectors:
-                    try:
-                        if ':contains(' in selector:
-                            # Use XPath for text-based selection
-                            xpath = f'//button[contains(text(), "Add") and contains(@class, "btn")]'
-                            add_btn = self.driver.find_element(By.XPATH, xpath)
-                        else:
-                            add_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        
-                        if add_btn and add_btn.is_displayed() and add_btn.is_enabled():
-                            print(f"Found Add button with selector: {selector}")
-                            # Scroll to button to ensure it's in view
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", add_btn)
-                            time.sleep(1)
-                            
-                            # Try clicking with JavaScript if regular click fails
-                            try:
-                                add_btn.click()
-                                print("Clicked Add button successfully")
-                                break
-                            except:
-                                print("Regular click failed, trying JavaScript click")
-                                self.driver.execute_script("arguments[0].click();", add_btn)
-                                print("JavaScript click successful")
-                                break
-                    except Exception as e:
-                        print(f"Selector {selector} failed: {e}")
-                        continue
-                
-                if add_btn:
-                    time.sleep(3)
-                    
-                    # Fill credential form fields
-                    def safe_fill_field(field_selector, field_value, field_name, field_type="input"):
-                        """Safely fill a field with error handling"""
-                        if not field_value:
-                            return True
-                            
-                        try:
-                            if field_type == "select":
-                                element = self.driver.find_element(By.ID, field_selector)
-                                select = Select(element)
-                                select.select_by_value(field_value)
-                                print(f"Successfully selected {field_name}: {field_value}")
-                                return True
-                            else:
-                                element = self.driver.find_element(By.ID, field_selector)
-                                if element and element.is_displayed():
-                                    element.clear()
-                                    element.send_keys(str(field_value))
-                                    print(f"Successfully filled {field_name}: {field_value}")
-                                    return True
-                        except Exception as e:
-                            print(f"Failed to fill {field_name}: {e}")
-                            return False
-                        
-                        print(f"Could not fill field {field_name}")
-                        return False
-                    
-                    # Reader Type (required selection)
-                    if credential_data.reader_type:
-                        safe_fill_field('readerType', credential_data.reader_type, 'Reader Type', 'select')
-                    
-                    # Card#/LPR/UID
-                    if credential_data.unique_identifier:
-                        # Try multiple approaches to fill the unique identifier field
-                        success = False
-                        unique_id_selectors = ['uniqueIdentifier', 'cardNumber', 'card_number', 'lpr', 'uid', 'credentialId', 'credential_id']
-                        
-                        for selector in unique_id_selectors:
-                            success = safe_fill_field(selector, credential_data.unique_identifier, 'Card#/LPR/UID')
-                            if success:
-                                break
-                        
-                        # If still not successful, try by name attribute
-                        if not success:
-                            for selector in unique_id_selectors:
-                                try:
-                                    element = self.driver.find_element(By.NAME, selector)
-                                    if element and element.is_displayed():
-                                        element.clear()
-                                        element.send_keys(str(credential_data.unique_identifier))
-                                        print(f"Successfully filled Card#/LPR/UID (by name): {credential_data.unique_identifier}")
-                                        success = True
-                                        break
-                                except:
-                                    continue
-                        
-                        if not success:
-                            print("ERROR: Could not find or fill Card#/LPR/UID field")
-                    
-                    # PIN
-                    if credential_data.pin:
-                        safe_fill_field('pin', credential_data.pin, 'PIN')
-                    
-                    # Active Date (if provided)
-                    if credential_data.active_date:
-                        # Split date and time if provided in format "YYYY-MM-DD HH:MM:SS"
-                        if ' ' in credential_data.active_date:
-                            date_part, time_part = credential_data.active_date.split(' ', 1)
-                            time_part = time_part[:5]  # Get HH:MM only
-                        else:
-                            date_part = credential_data.active_date
-                            time_part = "00:00"
-                        
-                        safe_fill_field('activeDatePlaceholder', date_part, 'Active Date')
-                        safe_fill_field('activeTimePlaceholder', time_part, 'Active Time')
-                    
-                    # Expiry Date (if provided)
-                    if credential_data.expiry_date:
-                        # Split date and time if provided in format "YYYY-MM-DD HH:MM:SS"
-                        if ' ' in credential_data.expiry_date:
-                            date_part, time_part = credential_data.expiry_date.split(' ', 1)
-                            time_part = time_part[:5]  # Get HH:MM only
-                        else:
-                            date_part = credential_data.expiry_date
-                            time_part = "23:59"
-                        
-                        safe_fill_field('expiryDatePlaceholder', date_part, 'Expiry Date')
-                        safe_fill_field('expiryTimePlaceholder', time_part, 'Expiry Time')
-                    
-                    # Use Limit
-                    if credential_data.use_limit:
-                        safe_fill_field('useLimit', str(credential_data.use_limit), 'Use Limit')
-                    
-                    # Comments
-                    if credential_data.comments:
-                        safe_fill_field('comments', credential_data.comments, 'Comments')
-                    
-                    # Status (default is ACTIVE)
-                    if credential_data.status:
-                        safe_fill_field('status', credential_data.status, 'Status', 'select')
-                    
-                    # Access Control List checkbox (default is checked)
-                    if credential_data.access_control_lists is not None:
-                        try:
-                            checkbox = self.driver.find_element(By.ID, 'accessControlListsIntegerArray1')
-                            if credential_data.access_control_lists and not checkbox.is_selected():
-                                checkbox.click()
-                                print("Checked Access Control List")
-                            elif not credential_data.access_control_lists and checkbox.is_selected():
-                                checkbox.click()
-                                print("Unchecked Access Control List")
-                        except Exception as e:
-                            print(f"Error handling Access Control List checkbox: {e}")
-                    
-                    # Click Save button
-                    print("Looking for save button...")
-                    save_btn = None
-                    save_selectors = [
-                        'button[value="save"]',
-                        'button#submitBtn',
-                        'button[type="submit"]:contains("Save")',
-                        'button.btn-primary[name="action"][value="save"]',
-                        '.btn-primary:contains("Save")'
-                    ]
-                    
-                    for selector in save_selectors:
-                        try:
-                            save_btn = self.driver.find_element(By.CSS_SELECTOR, selector)
-                            if save_btn and save_btn.is_displayed():
-                                print(f"Found save button with selector: {selector}")
-                                break
-                        except:
-                            continue
-                    
-                    if save_btn:
-                        print("Clicking save button...")
-                        save_btn.click()
-                        time.sleep(5)
-                        
-                        # Check for success indicators
-                        success_indicators = [
-                            '.alert-success',
-                            '.success-message',
-                            '.notification-success',
-                            '[class*="success"]'
-                        ]
-                        
-                        # Also check if we're still on the same page (might indicate success)
-                        current_url = self.driver.current_url
-                        if 'visitor/edit' in current_url and visitor_uuid in current_url:
-                            print("Credential likely added successfully (stayed on visitor page)")
-                            return True
-                        
-                        for indicator in success_indicators:
-                            try:
-                                success_element = self.driver.find_element(By.CSS_SELECTOR, indicator)
-                                if success_element and success_element.is_displayed():
-                                    print("Credential added successfully!")
-                                    return True
-                            except:
-                                continue
-                        
-                        return True  # Assume success if no error found
-                    else:
-                        print("Save button not found")
-                        return False
-                else:
-                    print("Add credential button not found")
-                    return False
-            else:
-                print("Credentials tab not found")
-                return False
-                
+            self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={visitor_uuid}#credentials')
+            return self.add_credential_to_visitor(credential_data)
         except Exception as e:
             print(f"Error adding credential: {e}")
             return False
 
+    @_without_implicit_wait
     def update_credential(self, search_term: str, credential_search_detail: str, credential_data: CredentialData):
         """Update an existing credential for a visitor using search term and credential search detail"""
         try:
             # Check if search_term is a UUID (format: xxxxxxxx-xxxx-xxxx-xxxx-xxxxxxxxxxxx)
-            is_uuid = len(search_term) == 36 and search_term.count('-') == 4
+            is_uuid = bool(UUID_RE.match(search_term))
             
             # If search_term is a UUID, navigate directly to that visitor
             if is_uuid:
-                self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={search_term}')
-                time.sleep(3)
+                self.driver.get(f'https://app.evtrack.com/visitor/edit?uuid={search_term}#credentials')
                 visitor_uuid = search_term
             else:
                 # If search_term is a name, need to search
@@ -673,20 +497,7 @@ class CredentialAutomation:
             
             # Step 1: Click on Credentials tab
             print("Step 1: Clicking Credentials tab...")
-            credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"][data-toggle="tab"]', timeout=10)
-            if not credentials_tab:
-                credentials_tab = wait_for_element(self.driver, By.CSS_SELECTOR, 'a[href="#credentials"]', timeout=5)
-            
-            if credentials_tab:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", credentials_tab)
-                time.sleep(1)
-                
-                try:
-                    credentials_tab.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", credentials_tab)
-                
-                time.sleep(3)
+            if self._ensure_credentials_tab():
                 print("Successfully clicked Credentials tab")
             else:
                 print("Could not find Credentials tab")
@@ -746,15 +557,13 @@ class CredentialAutomation:
                         continue
             
             if checkbox:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", checkbox)
-                time.sleep(1)
-                
+                self._js_click(checkbox)
+                # DataTables enables the Edit button once a row is selected
                 try:
-                    checkbox.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", checkbox)
-                
-                time.sleep(2)
+                    WebDriverWait(self.driver, 5, poll_frequency=WAIT_POLL_FREQUENCY).until(EC.visibility_of_element_located(
+                        (By.CSS_SELECTOR, 'button.dt-button.btn.btn-success:not(.disabled)')))
+                except TimeoutException:
+                    pass  # The Edit button lookup below reports the failure
                 print("Successfully selected credential")
             else:
                 print("Could not find credential checkbox to select")
@@ -786,15 +595,12 @@ class CredentialAutomation:
                         continue
             
             if edit_btn:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", edit_btn)
-                time.sleep(1)
-                
+                self._js_click(edit_btn)
                 try:
-                    edit_btn.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", edit_btn)
-                
-                time.sleep(3)
+                    self._wait.until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '#status, button[value="save"]')))
+                except TimeoutException:
+                    pass  # Missing form fields are reported when filling the form
                 print("Successfully clicked Edit button")
             else:
                 print("Could not find Edit button")
@@ -811,59 +617,21 @@ class CredentialAutomation:
             # - PIN (disabled)
             # We will only update the editable fields
             
-            # Active Date and Time
-            if credential_data.active_date:
-                active_date_field = wait_for_element(self.driver, By.ID, 'activeDatePlaceholder', timeout=5)
-                if active_date_field:
-                    active_date_field.clear()
-                    active_date_field.send_keys(credential_data.active_date)
-                    print(f"Updated Active Date: {credential_data.active_date}")
-            
-            if credential_data.active_time:
-                active_time_field = wait_for_element(self.driver, By.ID, 'activeTimePlaceholder', timeout=5)
-                if active_time_field:
-                    active_time_field.clear()
-                    active_time_field.send_keys(credential_data.active_time)
-                    print(f"Updated Active Time: {credential_data.active_time}")
-            
-            # Expiry Date and Time
-            if credential_data.expiry_date:
-                expiry_date_field = wait_for_element(self.driver, By.ID, 'expiryDatePlaceholder', timeout=5)
-                if expiry_date_field:
-                    expiry_date_field.clear()
-                    expiry_date_field.send_keys(credential_data.expiry_date)
-                    print(f"Updated Expiry Date: {credential_data.expiry_date}")
-            
-            if credential_data.expiry_time:
-                expiry_time_field = wait_for_element(self.driver, By.ID, 'expiryTimePlaceholder', timeout=5)
-                if expiry_time_field:
-                    expiry_time_field.clear()
-                    expiry_time_field.send_keys(credential_data.expiry_time)
-                    print(f"Updated Expiry Time: {credential_data.expiry_time}")
-            
-            # Use Limit
-            if credential_data.use_limit:
-                use_limit_field = wait_for_element(self.driver, By.ID, 'useLimit', timeout=5)
-                if use_limit_field:
-                    use_limit_field.clear()
-                    use_limit_field.send_keys(str(credential_data.use_limit))
-                    print(f"Updated Use Limit: {credential_data.use_limit}")
-            
-            # Comments
-            if credential_data.comments:
-                comments_field = wait_for_element(self.driver, By.ID, 'comments', timeout=5)
-                if comments_field:
-                    comments_field.clear()
-                    comments_field.send_keys(credential_data.comments)
-                    print(f"Updated Comments: {credential_data.comments}")
-            
-            # Status
-            if credential_data.status:
-                status_field = wait_for_element(self.driver, By.ID, 'status', timeout=5)
-                if status_field:
-                    select = Select(status_field)
-                    select.select_by_value(credential_data.status)
-                    print(f"Updated Status: {credential_data.status}")
+            # Set every editable field with one script instead of waiting on each field in turn
+            form_values = [(key, str(value)) for key, value in (
+                ('activeDatePlaceholder', credential_data.active_date),
+                ('activeTimePlaceholder', credential_data.active_time),
+                ('expiryDatePlaceholder', credential_data.expiry_date),
+                ('expiryTimePlaceholder', credential_data.expiry_time),
+                ('useLimit', credential_data.use_limit),
+                ('comments', credential_data.comments),
+                ('status', credential_data.status)
+            ) if value]
+            missing = self.driver.execute_script(FILL_CREDENTIAL_FORM_JS, form_values, None)
+            if missing:
+                print(f"ERROR: Could not update credential form fields: {', '.join(missing)}")
+                return False
+            print(f"Updated credential form fields: {', '.join(key for key, _ in form_values)}")
             
             # Step 6: Click Save button
             print("Step 6: Clicking Save button...")
@@ -890,15 +658,12 @@ class CredentialAutomation:
                         continue
             
             if save_btn:
-                self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", save_btn)
-                time.sleep(1)
-                
+                self._js_click(save_btn)
+                # Submitting navigates away, which detaches the old Save button
                 try:
-                    save_btn.click()
-                except Exception as e:
-                    self.driver.execute_script("arguments[0].click();", save_btn)
-                
-                time.sleep(4)
+                    self._wait.until(EC.staleness_of(save_btn))
+                except TimeoutException:
+                    pass
                 print("Successfully clicked Save button")
                 
                 current_url = self.driver.current_url
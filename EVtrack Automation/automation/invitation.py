@@ -7,9 +7,9 @@ import time
 logger = logging.getLogger(__name__)
 
 class InvitationAutomation:
-    def __init__(self, driver):
+    def __init__(self, driver, websocket=None):
         self.driver = driver
-        self.websocket = None
+        self.websocket = websocket
         self.logger = logging.getLogger(__name__)
         
     def set_websocket(self, websocket):
@@ -80,8 +80,7 @@ class InvitationAutomation:
             
             # Import here to avoid circular imports
             from .visitor_search import VisitorSearchAutomation
-            search_automation = VisitorSearchAutomation(self.driver)
-            search_automation.set_websocket(self.websocket)
+            search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
             
             # First, navigate to visitor list and handle login if needed
             self.driver.get('https://app.evtrack.com/visitor/list')
@@ -3,129 +3,273 @@ from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from utils.selenium_utils import wait_for_element, fill_text_field, click_element
+import json
+import os
+import stat
+import threading
 import time
 import logging
+import weakref
+import requests
 
 logger = logging.getLogger(__name__)
 
+# Drivers that have completed a login. Pooled drivers keep their cookies between
+# requests, so these can usually skip the login form entirely.
+_logged_in_drivers = weakref.WeakSet()
+
+SESSION_CHECK_URL = 'https://app.evtrack.com/visitor/dashboard'
+
+# Cookies from the most recent successful login, shared so a fresh driver can
+# adopt the session instead of filling in the login form
+_session_cookies = []
+_session_saved_at = None
+
+# The same cookies on disk, so other workers on the host and restarted processes
+# can adopt the session as well. They are credentials, so the default lives in a
+# directory only this user can reach rather than the shared temp dir.
+SESSION_COOKIE_FILE = os.getenv('EVTRACK_COOKIE_FILE') or os.path.join(
+    os.getenv('XDG_RUNTIME_DIR') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'evtrack', 'session.json')
+
+def _save_session_cookies(cookies):
+    """Share cookies from a fresh login with this process and, through the cookie file, the others"""
+    global _session_saved_at
+    _session_cookies[:] = cookies
+    _session_saved_at = time.time()
+    temp_path = f"{SESSION_COOKIE_FILE}.{os.getpid()}"
+    try:
+        os.makedirs(os.path.dirname(SESSION_COOKIE_FILE), mode=0o700, exist_ok=True)
+        # Session cookies are credentials: owner-only, and swapped in atomically
+        with os.fdopen(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+            json.dump({'saved_at': _session_saved_at, 'cookies': cookies}, f)
+        os.replace(temp_path, SESSION_COOKIE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write session cookie file: {str(e)}")
+
+def _read_session_cookie_file():
+    """
+    Return the parsed cookie file, or None when it is missing, not private to this
+    user (owned by another uid or not mode 0600) or not in the format we write
+    """
+    try:
+        fd = os.open(SESSION_COOKIE_FILE, os.O_RDONLY | getattr(os, 'O_NOFOLLOW', 0))
+    except OSError:
+        return None
+    with os.fdopen(fd) as f:
+        info = os.fstat(fd)
+        if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or stat.S_IMODE(info.st_mode) != 0o600):
+            logger.warning(f"Ignoring session cookie file {SESSION_COOKIE_FILE}: not owned by this user with mode 0600")
+            return None
+        try:
+            saved = json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    if not isinstance(saved, dict):
+        return None
+    saved_at, cookies = saved.get('saved_at'), saved.get('cookies')
+    if (isinstance(saved_at, bool) or not isinstance(saved_at, (int, float)) or not isinstance(cookies, list)
+            or not all(isinstance(cookie, dict) and isinstance(cookie.get('name'), str)
+                       and isinstance(cookie.get('value'), str) for cookie in cookies)):
+        logger.warning(f"Ignoring malformed session cookie file {SESSION_COOKIE_FILE}")
+        return None
+    return saved
+
+def _load_session_cookies():
+    """Adopt cookies from the cookie file when they are newer than the ones in memory"""
+    global _session_saved_at
+    saved = _read_session_cookie_file()
+    if saved is None:
+        return
+    if _session_saved_at is None or saved['saved_at'] > _session_saved_at:
+        _session_cookies[:] = saved['cookies']
+        _session_saved_at = saved['saved_at']
+
+# Serializes logins so concurrent requests don't all submit the form at once. A
+# thread lock because the API runs each login on its Selenium worker threads.
+_login_lock = threading.Lock()
+
+def check_saved_session(timeout=10):
+    """
+    Check the shared session cookies against EVTrack with a plain HTTP request, no browser
+    Returns True if EVTrack still serves the dashboard for them, False if there is no
+    saved session, it has expired (EVTrack redirects to /login) or EVTrack can't be reached.
+    """
+    _load_session_cookies()
+    if not _session_cookies:
+        return False
+    cookies = {cookie['name']: cookie['value'] for cookie in _session_cookies}
+    try:
+        response = requests.get(SESSION_CHECK_URL, cookies=cookies, allow_redirects=False, timeout=timeout)
+    except requests.RequestException as e:
+        logger.warning(f"Session check failed: {str(e)}")
+        return False
+    return response.status_code == 200
+
 class EvTrackLogin:
     def __init__(self, driver):
         self.driver = driver
         
+    def has_session(self):
+        """Return True if this driver logged in earlier and EVTrack hasn't expired the session"""
+        if self.driver not in _logged_in_drivers:
+            return False
+        self.driver.get(SESSION_CHECK_URL)
+        if '/login' in self.driver.current_url:
+            _logged_in_drivers.discard(self.driver)
+            return False
+        return True
+        
+    def restore_session(self):
+        """Load the shared session cookies into this driver; returns True if EVTrack accepts them"""
+        _load_session_cookies()
+        if not _session_cookies:
+            return False
+        # Cookies can only be added for the domain the browser is currently on
+        self.driver.get('https://app.evtrack.com/login')
+        for cookie in _session_cookies:
+            try:
+                self.driver.add_cookie(cookie)
+            except Exception:
+                continue
+        self.driver.get(SESSION_CHECK_URL)
+        if '/login' in self.driver.current_url:
+            _session_cookies.clear()
+            return False
+        logger.info(f"Restored EVTrack session saved {time.time() - _session_saved_at:.0f}s ago")
+        _logged_in_drivers.add(self.driver)
+        return True
+        
     async def login(self, email, password):
         try:
-            # Navigate to login page
-            logger.info("Navigating to login page")
-            self.driver.get('https://app.evtrack.com/login')
-            
-            # Wait for login form with multiple selectors
-            login_form_found = False
-            selectors = [
-                (By.CSS_SELECTOR, 'input[name="username"]'),
-                (By.CSS_SELECTOR, 'input[type="email"]'),
-                (By.CSS_SELECTOR, 'form input[type="text"]')
-            ]
-            
-            for selector_type, selector in selectors:
-                try:
-                    logger.info(f"Trying to find login form with selector: {selector}")
-                    wait_for_element(self.driver, selector_type, selector, timeout=5)
-                    login_form_found = True
-                    logger.info("Login form found")
-                    break
-                except Exception:
-                    continue
-                    
-            if not login_form_found:
-                raise Exception("Could not find login form after multiple attempts")
-            
-            # Wait for page to load
-            time.sleep(2)
-            
-            # Wait for login form
-            logger.info("Waiting for login form")
-            wait_for_element(
-                self.driver, 
-                By.CSS_SELECTOR, 
-                'input[name="username"]',
-                timeout=20
-            )
+            if self.has_session():
+                logger.info("Reusing existing EVTrack session")
+                return True
             
-            logger.info("Login form found, filling credentials")
-            # Fill credentials with multiple selector attempts
-            username_selectors = [
-                ('input[name="username"]', 'name'),
-                ('input[type="email"]', 'type'),
-                ('input[name="email"]', 'name')
-            ]
+            with _login_lock:
+                # Another request may have logged in while this one waited
+                if self.restore_session():
+                    return True
+                return self._login_with_form(email, password)
             
-            username_filled = False
-            for selector, attr_type in username_selectors:
-                try:
-                    fill_text_field(self.driver, By.CSS_SELECTOR, selector, email)
-                    username_filled = True
-                    logger.info(f"Username filled using {attr_type} selector")
-                    break
-                except Exception:
-                    continue
-                    
-            if not username_filled:
-                raise Exception("Could not fill username/email field")
+        except Exception as e:
+            logger.error(f"Login error: {str(e)}")
+            raise Exception(f"Login failed: {str(e)}")
+    
+    def _login_with_form(self, email, password):
+        """Fill in and submit the EVTrack login form, then share the new session cookies"""
+        
+        # Navigate to login page
+        logger.info("Navigating to login page")
+        self.driver.get('https://app.evtrack.com/login')
+        
+        # Wait for login form with multiple selectors
+        login_form_found = False
+        selectors = [
+            (By.CSS_SELECTOR, 'input[name="username"]'),
+            (By.CSS_SELECTOR, 'input[type="email"]'),
+            (By.CSS_SELECTOR, 'form input[type="text"]')
+        ]
+        
+        for selector_type, selector in selectors:
+            try:
+                logger.info(f"Trying to find login form with selector: {selector}")
+                wait_for_element(self.driver, selector_type, selector, timeout=5)
+                login_form_found = True
+                logger.info("Login form found")
+                break
+            except Exception:
+                continue
                 
-            # Fill password with similar fallbacks
-            password_selectors = [
-                'input[name="password"]',
-                'input[type="password"]'
-            ]
-            
-            password_filled = False
-            for selector in password_selectors:
-                try:
-                    fill_text_field(self.driver, By.CSS_SELECTOR, selector, password)
-                    password_filled = True
-                    logger.info("Password field filled")
-                    break
-                except Exception:
-                    continue
-                    
-            if not password_filled:
-                raise Exception("Could not fill password field")
+        if not login_form_found:
+            raise Exception("Could not find login form after multiple attempts")
+        
+        # Wait for page to load
+        time.sleep(2)
+        
+        # Wait for login form
+        logger.info("Waiting for login form")
+        wait_for_element(
+            self.driver, 
+            By.CSS_SELECTOR, 
+            'input[name="username"]',
+            timeout=20
+        )
+        
+        logger.info("Login form found, filling credentials")
+        # Fill credentials with multiple selector attempts
+        username_selectors = [
+            ('input[name="username"]', 'name'),
+            ('input[type="email"]', 'type'),
+            ('input[name="email"]', 'name')
+        ]
+        
+        username_filled = False
+        for selector, attr_type in username_selectors:
+            try:
+                fill_text_field(self.driver, By.CSS_SELECTOR, selector, email)
+                username_filled = True
+                logger.info(f"Username filled using {attr_type} selector")
+                break
+            except Exception:
+                continue
                 
-            time.sleep(1)  # Wait for fields to settle
+        if not username_filled:
+            raise Exception("Could not fill username/email field")
             
-            # Click login button
-            logger.info("Clicking login button")
-            click_element(self.driver, By.CSS_SELECTOR, '.btn.btn-lg.btn-warning.btn-block')
+        # Fill password with similar fallbacks
+        password_selectors = [
+            'input[name="password"]',
+            'input[type="password"]'
+        ]
+        
+        password_filled = False
+        for selector in password_selectors:
+            try:
+                fill_text_field(self.driver, By.CSS_SELECTOR, selector, password)
+                password_filled = True
+                logger.info("Password field filled")
+                break
+            except Exception:
+                continue
+                
+        if not password_filled:
+            raise Exception("Could not fill password field")
             
-            # Wait for successful login with multiple verification attempts
-            logger.info("Waiting for successful login")
-            max_retries = 3
-            retry_count = 0
+        time.sleep(1)  # Wait for fields to settle
+        
+        # Click login button
+        logger.info("Clicking login button")
+        click_element(self.driver, By.CSS_SELECTOR, '.btn.btn-lg.btn-warning.btn-block')
+        
+        # Wait for successful login with multiple verification attempts
+        logger.info("Waiting for successful login")
+        max_retries = 3
+        retry_count = 0
+        
+        while retry_count < max_retries:
+            time.sleep(2)
+            current_url = self.driver.current_url.lower()
             
-            while retry_count < max_retries:
-                time.sleep(2)
-                current_url = self.driver.current_url.lower()
+            if "login" not in current_url:
+                logger.info(f"Successfully logged in, current URL: {current_url}")
+                break
                 
-                if "login" not in current_url:
-                    logger.info(f"Successfully logged in, current URL: {current_url}")
-                    break
-                    
-                retry_count += 1
-                if retry_count == max_retries:
-                    logger.error(f"Login verification failed, still on: {current_url}")
-                    # Try to capture any error messages
-                    try:
-                        error_messages = self.driver.find_elements(By.CSS_SELECTOR, '.alert, .error, .message')
-                        if error_messages:
-                            error_text = ' | '.join([msg.text for msg in error_messages])
-                            raise Exception(f"Login failed: {error_text}")
-                    except:
-                        pass
-                    raise Exception("Login failed: Still on login page after multiple attempts")
-                
-            logger.info("Login successful")
-            return True
+            retry_count += 1
+            if retry_count == max_retries:
+                logger.error(f"Login verification failed, still on: {current_url}")
+                # Try to capture any error messages
+                try:
+                    error_messages = self.driver.find_elements(By.CSS_SELECTOR, '.alert, .error, .message')
+                    if error_messages:
+                        error_text = ' | '.join([msg.text for msg in error_messages])
+                        raise Exception(f"Login failed: {error_text}")
+                except:
+                    pass
+                raise Exception("Login failed: Still on login page after multiple attempts")
             
-        except Exception as e:
-            logger.error(f"Login error: {str(e)}")
-            raise Exception(f"Login failed: {str(e)}")
+        logger.info("Login successful")
+        _logged_in_drivers.add(self.driver)
+        _save_session_cookies(self.driver.get_cookies())
+        return True
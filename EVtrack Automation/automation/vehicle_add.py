@@ -35,9 +35,7 @@ class VehicleAddAutomation:
             # Step 1: Search for the visitor using the same method as invite/badge
             await self.update_progress(5, f"Searching for visitor: {search_term}")
             
-            search_automation = VisitorSearchAutomation(self.driver)
-            if self.websocket:
-                search_automation.set_websocket(self.websocket)
+            search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
             
             # Search for the visitor using the reliable search method
             visitor_data = await search_automation.search_visitor_case_insensitive(search_term)
@@ -311,7 +311,7 @@ class VisitorAddAutomation:
     async def _upload_file_to_uppy(self, field_id, file_info):
         """Upload a file to an Uppy widget exactly like the HTML site."""
         try:
-            self.logger.info(f"Uploading file for {field_id}: {file_info.get('filename', 'unknown')} ({len(file_info.get('file_data', b''))} bytes)")
+            self.logger.info(f"Uploading file for {field_id}: {file_info.get('filename', 'unknown')} ({file_info.get('size') or len(file_info.get('file_data', b''))} bytes)")
             
             # Find the Uppy widget container
             uppy_container_id = f"uppy-{field_id}"
@@ -363,15 +363,21 @@ class VisitorAddAutomation:
                 self.logger.error(f"Could not find file input in Uppy container: {uppy_container_id}")
                 return False
             
-            # Create a temporary file with the uploaded content
-            file_extension = os.path.splitext(file_info['filename'])[1] if file_info.get('filename') else '.tmp'
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(file_info['file_data'])
-                temp_file_path = temp_file.name
+            temp_file_path = None
+            if file_info.get('path'):
+                # The API already streamed the upload to disk; Selenium only needs its path
+                upload_path = file_info['path']
+            else:
+                # Create a temporary file with the uploaded content
+                file_extension = os.path.splitext(file_info['filename'])[1] if file_info.get('filename') else '.tmp'
+                with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
+                    temp_file.write(file_info['file_data'])
+                    temp_file_path = temp_file.name
+                upload_path = temp_file_path
             
             try:
                 # Upload the file using the file input
-                file_input.send_keys(temp_file_path)
+                file_input.send_keys(upload_path)
                 self.logger.info(f"File uploaded to Uppy for {field_id}")
                 
                 # Quick wait for upload processing (optimized for speed)
@@ -428,11 +434,12 @@ class VisitorAddAutomation:
                 return success
                 
             finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+                # Clean up the temporary file (files passed by path belong to the caller)
+                if temp_file_path:
+                    try:
+                        os.unlink(temp_file_path)
+                    except:
+                        pass
                     
         except Exception as e:
             self.logger.warning(f"Could not upload file for {field_id}: {str(e)}")
@@ -11,9 +11,9 @@ import tempfile
 import os
 
 class VisitorCreateUpdateAutomation:
-    def __init__(self, driver):
+    def __init__(self, driver, websocket=None):
         self.driver = driver
-        self.websocket = None
+        self.websocket = websocket
         self.logger = logging.getLogger(__name__)
         
     def set_websocket(self, websocket):
@@ -34,17 +34,18 @@ class VisitorCreateUpdateAutomation:
             # Handle file data - ensure we have the correct structure
             if isinstance(file_data, dict):
                 filename = file_data.get('filename')
+                file_path = file_data.get('path')
                 file_content = file_data.get('content') or file_data.get('file_data')
                 content_type = file_data.get('content_type', 'application/octet-stream')
                 
-                if not filename or not file_content:
+                if not filename or not (file_path or file_content):
                     self.logger.error(f"Missing filename or content in file_data for {file_key}")
                     return False
             else:
                 self.logger.error(f"File data is not a dict for {file_key}: {type(file_data)}")
                 return False
                 
-            self.logger.info(f"Uploading {file_key}: {filename} ({len(file_content)} bytes)")
+            self.logger.info(f"Uploading {file_key}: {filename} ({file_data.get('size') or len(file_content)} bytes)")
             
             # Map file keys to Uppy container IDs exactly like the HTML site
             uppy_id_map = {
@@ -105,29 +106,35 @@ class VisitorCreateUpdateAutomation:
                 self.logger.error(f"Could not find file input in Uppy container: {uppy_id}")
                 return False
             
-            # Process file content - handle both base64 and binary data
-            if isinstance(file_content, str):
-                if file_content.startswith('data:'):
-                    # Remove data URL prefix and decode
-                    header, data = file_content.split(',', 1)
-                    file_content = base64.b64decode(data)
-                else:
-                    # Assume it's base64 encoded
-                    try:
-                        file_content = base64.b64decode(file_content)
-                    except:
-                        # If base64 decode fails, treat as plain text
-                        file_content = file_content.encode('utf-8')
-            
-            # Create temporary file for upload
-            file_extension = os.path.splitext(filename)[1] if filename else '.tmp'
-            with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
-                temp_file.write(file_content)
-                temp_file_path = temp_file.name
+            temp_file_path = None
+            if file_path:
+                # The API already streamed the upload to disk; Selenium only needs its path
+                upload_path = file_path
+            else:
+                # Process file content - handle both base64 and binary data
+                if isinstance(file_content, str):
+                    if file_content.startswith('data:'):
+                        # Remove data URL prefix and decode
+                        header, data = file_content.split(',', 1)
+                        file_content = base64.b64decode(data)
+                    else:
+                        # Assume it's base64 encoded
+                        try:
+                            file_content = base64.b64decode(file_content)
+                        except:
+                            # If base64 decode fails, treat as plain text
+                            file_content = file_content.encode('utf-8')
+                
+                # Create temporary file for upload
+                file_extension = os.path.splitext(filename)[1] if filename else '.tmp'
+                with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as temp_file:
+                    temp_file.write(file_content)
+                    temp_file_path = temp_file.name
+                upload_path = temp_file_path
             
             try:
                 # Upload the file using Selenium
-                file_input.send_keys(temp_file_path)
+                file_input.send_keys(upload_path)
                 time.sleep(1.5)  # Quick wait for Uppy to process
                 
                 # Quick verification - don't wait too long
@@ -185,11 +192,12 @@ class VisitorCreateUpdateAutomation:
                     return False
                     
             finally:
-                # Clean up temporary file
-                try:
-                    os.unlink(temp_file_path)
-                except:
-                    pass
+                # Clean up temporary file (files passed by path belong to the caller)
+                if temp_file_path:
+                    try:
+                        os.unlink(temp_file_path)
+                    except:
+                        pass
                     
         except Exception as e:
             self.logger.error(f"Failed to upload {file_key}: {str(e)}")
@@ -206,8 +214,7 @@ class VisitorCreateUpdateAutomation:
             # Import VisitorSearchAutomation to find the visitor first
             from automation.visitor_search import VisitorSearchAutomation
             
-            search_automation = VisitorSearchAutomation(self.driver)
-            search_automation.set_websocket(self.websocket)
+            search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
             
             # Use the provided search term
             if not search_term:
@@ -10,9 +10,9 @@ import requests
 logger = logging.getLogger(__name__)
 
 class VisitorDetailsAutomation:
-    def __init__(self, driver):
+    def __init__(self, driver, websocket=None):
         self.driver = driver
-        self.websocket = None
+        self.websocket = websocket
         self.logger = logging.getLogger(__name__)
         
     def set_websocket(self, websocket):
@@ -9,9 +9,9 @@ import re
 logger = logging.getLogger(__name__)
 
 class VisitorSearchAutomation:
-    def __init__(self, driver):
+    def __init__(self, driver, websocket=None):
         self.driver = driver
-        self.websocket = None
+        self.websocket = websocket
         self.logger = logging.getLogger(__name__)
         
     def set_websocket(self, websocket):
@@ -26,23 +26,25 @@ class VisitorSearchAutomation:
             })
         self.logger.info(f"Progress: {percent}% - {status}")
 
-    async def search_visitor_by_term(self, search_term):
-        """Search for a visitor using the visitor list page."""
+    async def search_visitor_by_term(self, search_term, reload=True):
+        """Search for a visitor using the visitor list page.
+        With reload=False an already open list page is searched again instead of being reloaded."""
         try:
             await self.update_progress(10, f"Searching for visitor: {search_term}")
             
-            # Navigate to visitor list page - exact URL from requirements
-            self.driver.get('https://app.evtrack.com/visitor/list')
-            
-            # Login check - if we're redirected to login, we need credentials from the calling method
-            if '/login' in self.driver.current_url:
-                self.logger.info("Redirected to login page - login will be handled by InvitationAutomation")
-                raise Exception("Not logged in - login required")
+            if reload or '/visitor/list' not in self.driver.current_url:
+                # Navigate to visitor list page - exact URL from requirements
+                self.driver.get('https://app.evtrack.com/visitor/list')
+                
+                # Login check - if we're redirected to login, we need credentials from the calling method
+                if '/login' in self.driver.current_url:
+                    self.logger.info("Redirected to login page - login will be handled by InvitationAutomation")
+                    raise Exception("Not logged in - login required")
 
-            # Wait for table to load
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, 'dataTables_wrapper'))
-            )
+                # Wait for table to load
+                WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, 'dataTables_wrapper'))
+                )
             
             # Find the search input using exact HTML structure
             # HTML: <label>Search:<input type="search" class="form-control input-sm" placeholder="" aria-controls="listTable"></label>
@@ -131,16 +133,18 @@ class VisitorSearchAutomation:
             self.logger.error(f"Error searching for visitor: {str(e)}")
             return None
 
-    async def search_visitor_case_insensitive(self, search_term):
+    async def search_visitor_case_insensitive(self, search_term, reload=True):
         """
         Perform a more efficient search - try exact search first, then fallbacks only if needed.
+        The fallbacks reuse the list page loaded by the first attempt; reload=False reuses an
+        already open list page for the first attempt too.
         """
         try:
             await self.update_progress(5, f"Searching for visitor: {search_term}")
             
             # First try the original search term
             self.logger.info(f"Trying exact search for: {search_term}")
-            result = await self.search_visitor_by_term(search_term)
+            result = await self.search_visitor_by_term(search_term, reload=reload)
             if result:
                 self.logger.info(f"Found visitor on exact search: {result.get('first_name', '')} {result.get('last_name', '')}")
                 return result
@@ -161,7 +165,7 @@ class VisitorSearchAutomation:
             # Try case variations first
             for variation in variations_to_try:
                 self.logger.info(f"Trying case variation: {variation}")
-                result = await self.search_visitor_by_term(variation)
+                result = await self.search_visitor_by_term(variation, reload=False)
                 if result:
                     self.logger.info(f"Found visitor with case variation: {result.get('first_name', '')} {result.get('last_name', '')}")
                     return result
@@ -174,7 +178,7 @@ class VisitorSearchAutomation:
                 if len(parts) >= 1:
                     first_name = parts[0]
                     self.logger.info(f"Trying first name only: {first_name}")
-                    result = await self.search_visitor_by_term(first_name)
+                    result = await self.search_visitor_by_term(first_name, reload=False)
                     if result:
                         # Verify match
                         full_name = f"{result.get('first_name', '')} {result.get('last_name', '')}".lower()
@@ -186,7 +190,7 @@ class VisitorSearchAutomation:
                 if len(parts) >= 2:
                     last_name = parts[-1]
                     self.logger.info(f"Trying last name only: {last_name}")
-                    result = await self.search_visitor_by_term(last_name)
+                    result = await self.search_visitor_by_term(last_name, reload=False)
                     if result:
                         # Verify match
                         full_name = f"{result.get('first_name', '')} {result.get('last_name', '')}".lower()
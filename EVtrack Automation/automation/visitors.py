@@ -10,9 +10,9 @@ import time
 logger = logging.getLogger(__name__)
 
 class VisitorAutomation:
-    def __init__(self, driver):
+    def __init__(self, driver, websocket=None):
         self.driver = driver
-        self.websocket = None
+        self.websocket = websocket
         self.logger = logging.getLogger(__name__)
         
     def set_websocket(self, websocket):
@@ -253,7 +253,7 @@ class VisitorAutomation:
             self.logger.info(f"Successfully extracted visitor details for UUID: {visitor_info['uuid']}")
             
             # Count populated fields for logging
-            populated_fields = len([v for v in visitor_info.values() if v != "Not provided" and v != ""])
+            populated_fields = sum(1 for v in visitor_info.values() if v not in ("Not provided", ""))
             self.logger.info(f"Extracted {populated_fields} populated fields out of {len(visitor_info)} total fields")
             
             return visitor_info
@@ -263,6 +263,72 @@ class VisitorAutomation:
             await self.update_progress(100, "Failed to get details")
             raise
 
+    async def _get_profile_summary(self, visitor_uuid):
+        """Build a visitor summary from the visitor's comprehensive profile page"""
+        from .visitor_details import VisitorDetailsAutomation
+        details_automation = VisitorDetailsAutomation(self.driver, websocket=self.websocket)
+
+        profile_data = await details_automation.get_comprehensive_visitor_profile(visitor_uuid)
+
+        # Convert comprehensive profile to visitor summary format
+        comprehensive_visitor = {
+            'uuid': visitor_uuid,
+            'first_name': profile_data.get('basic_info', {}).get('first_name', ''),
+            'last_name': profile_data.get('basic_info', {}).get('last_name', ''),
+            'mobile': profile_data.get('contact_info', {}).get('mobile_number', ''),
+            'email': profile_data.get('contact_info', {}).get('email', ''),
+            'company': profile_data.get('contact_info', {}).get('company', ''),
+            'nationality': profile_data.get('personal_details', {}).get('nationality', ''),
+            'country_of_issue': profile_data.get('personal_details', {}).get('country_of_issue', ''),
+            'reason_for_visit': profile_data.get('visit_info', {}).get('reason_for_visit', ''),
+            'created_by': profile_data.get('metadata', {}).get('created_by', ''),
+            'created_at': profile_data.get('metadata', {}).get('created_at', ''),
+            'updated_at': profile_data.get('metadata', {}).get('updated_at', ''),
+            'status': 'Current',
+            'profile_url': f"https://app.evtrack.com/visitor/edit?uuid={visitor_uuid}"
+        }
+
+        # Add all additional fields from profile
+        for section_name, section_data in profile_data.items():
+            if isinstance(section_data, dict):
+                for field_name, field_value in section_data.items():
+                    if field_name not in comprehensive_visitor and field_value:
+                        comprehensive_visitor[field_name] = field_value
+        
+        return comprehensive_visitor
+
+    async def get_visitor_summaries(self, search_terms, on_result=None):
+        """Look up several visitors, returning one result per search term in order.
+
+        All terms are searched on a single load of the visitor list page before any
+        profile page is opened, instead of reloading the list for every term. Each
+        result is the visitor list get_visitor_summary would return, or the exception
+        raised for that term. on_result(index, result), if given, is called as soon
+        as each term's result is known."""
+        from .visitor_search import VisitorSearchAutomation
+        search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
+        
+        matches = []
+        for search_term in search_terms:
+            await self.update_progress(0, f"Searching for specific visitor: {search_term}")
+            matches.append(await search_automation.search_visitor_case_insensitive(search_term, reload=False))
+        
+        results = []
+        for index, (search_term, visitor_data) in enumerate(zip(search_terms, matches)):
+            if not visitor_data:
+                results.append([])
+            else:
+                try:
+                    results.append([await self._get_profile_summary(visitor_data['uuid'])])
+                except Exception as e:
+                    self.logger.error(f"Error getting visitor summary for {search_term}: {str(e)}")
+                    results.append(e)
+            if on_result:
+                on_result(index, results[-1])
+        
+        await self.update_progress(100, f"Looked up {len(search_terms)} visitors")
+        return results
+
     async def get_visitor_summary(self, search_term=None):
         """Get visitor summary - if search_term provided, search for specific visitor with full details.
         If no search_term, get all visitors from the list page."""
@@ -272,9 +338,7 @@ class VisitorAutomation:
                 await self.update_progress(0, f"Searching for specific visitor: {search_term}")
                 
                 from .visitor_search import VisitorSearchAutomation
-                search_automation = VisitorSearchAutomation(self.driver)
-                if self.websocket:
-                    search_automation.set_websocket(self.websocket)
+                search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
                 
                 visitor_data = await search_automation.search_visitor_case_insensitive(search_term)
                 
@@ -287,37 +351,7 @@ class VisitorAutomation:
                 
                 await self.update_progress(50, f"Getting comprehensive profile for {visitor_name}")
                 
-                from .visitor_details import VisitorDetailsAutomation
-                details_automation = VisitorDetailsAutomation(self.driver)
-                if self.websocket:
-                    details_automation.set_websocket(self.websocket)
-                
-                profile_data = await details_automation.get_comprehensive_visitor_profile(visitor_uuid)
-                
-                # Convert comprehensive profile to visitor summary format
-                comprehensive_visitor = {
-                    'uuid': visitor_uuid,
-                    'first_name': profile_data.get('basic_info', {}).get('first_name', ''),
-                    'last_name': profile_data.get('basic_info', {}).get('last_name', ''),
-                    'mobile': profile_data.get('contact_info', {}).get('mobile_number', ''),
-                    'email': profile_data.get('contact_info', {}).get('email', ''),
-                    'company': profile_data.get('contact_info', {}).get('company', ''),
-                    'nationality': profile_data.get('personal_details', {}).get('nationality', ''),
-                    'country_of_issue': profile_data.get('personal_details', {}).get('country_of_issue', ''),
-                    'reason_for_visit': profile_data.get('visit_info', {}).get('reason_for_visit', ''),
-                    'created_by': profile_data.get('metadata', {}).get('created_by', ''),
-                    'created_at': profile_data.get('metadata', {}).get('created_at', ''),
-                    'updated_at': profile_data.get('metadata', {}).get('updated_at', ''),
-                    'status': 'Current',
-                    'profile_url': f"https://app.evtrack.com/visitor/edit?uuid={visitor_uuid}"
-                }
-                
-                # Add all additional fields from profile
-                for section_name, section_data in profile_data.items():
-                    if isinstance(section_data, dict):
-                        for field_name, field_value in section_data.items():
-                            if field_name not in comprehensive_visitor and field_value:
-                                comprehensive_visitor[field_name] = field_value
+                comprehensive_visitor = await self._get_profile_summary(visitor_uuid)
                 
                 await self.update_progress(100, f"Complete profile retrieved for {visitor_name}")
                 return [comprehensive_visitor]
@@ -471,16 +505,19 @@ class VisitorAutomation:
             await self.update_progress(100, "Failed to update visitor")
             raise
 
-    async def get_visitor_badge(self, search_term):
-        """Generate and retrieve a visitor badge by searching for the visitor first."""
+    async def get_visitor_badge(self, search_term, as_base64=True):
+        """
+        Generate and retrieve a visitor badge by searching for the visitor first.
+
+        With as_base64=False the raw bytes are returned as 'badge_bytes' instead of
+        the base64 'badge_content', for callers that send the file straight back.
+        """
         try:
             await self.update_progress(0, f"Searching for visitor: {search_term}")
             
             # Use the new VisitorSearchAutomation for reliable search
             from .visitor_search import VisitorSearchAutomation
-            search_automation = VisitorSearchAutomation(self.driver)
-            if self.websocket:
-                search_automation.set_websocket(self.websocket)
+            search_automation = VisitorSearchAutomation(self.driver, websocket=self.websocket)
             
             # Search for the visitor using the reliable search method
             visitor_data = await search_automation.search_visitor_case_insensitive(search_term)
@@ -545,15 +582,10 @@ class VisitorAutomation:
                 response.close()
             
             if response.status_code == 200:
-                import base64
-                
                 # Get the content without triggering any downloads
                 badge_content_bytes = content_bytes
                 content_type = response.headers.get('Content-Type', 'application/pdf')
                 
-                # Encode PDF content for both display and download
-                badge_content = base64.b64encode(badge_content_bytes).decode('utf-8')
-                
                 await self.update_progress(100, "Badge content fetched successfully - NO downloads triggered")
                 
                 self.logger.info(f"Badge content fetched for {visitor_name}. Content type: {content_type}, Size: {len(badge_content_bytes)} bytes")
@@ -568,16 +600,22 @@ class VisitorAutomation:
                     self.logger.error(f" CRITICAL: Browser URL changed from {original_url} to {final_url}")
                     raise Exception(f"Unexpected browser navigation detected - URL changed to {final_url}")
                 
-                return {
+                result = {
                     'success': True,
                     'message': 'Visitor badge generated successfully',
                     'visitor_uuid': visitor_uuid,
                     'visitor_name': visitor_name,
                     'badge_url': badge_url,
-                    'badge_content': badge_content,
                     'content_type': content_type,
                     'filename': f'badge_{visitor_uuid}.pdf'
                 }
+                if as_base64:
+                    # Encode PDF content for both display and download
+                    import base64
+                    result['badge_content'] = base64.b64encode(badge_content_bytes).decode('utf-8')
+                else:
+                    result['badge_bytes'] = badge_content_bytes
+                return result
             else:
                 raise Exception(f"Failed to download badge. Status code: {response.status_code}")
             
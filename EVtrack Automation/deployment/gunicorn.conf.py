@@ -0,0 +1,34 @@
+"""
+Gunicorn configuration for container / EC2 deployments of the EvTrack Automation API
+
+Run from the project root:
+    gunicorn -c deployment/gunicorn.conf.py api.main:app
+
+Runs the app on uvicorn workers under gunicorn's process management. Every
+worker starts and logs in its own pool of Chrome drivers, and /ws progress only
+reaches requests handled by the worker holding the socket, so it defaults to a
+single worker; raise WEB_CONCURRENCY only as far as the host can run browsers.
+AWS Lambda deployments don't use this file: each Lambda container serves one
+request at a time through Mangum.
+"""
+
+import os
+
+from uvicorn.workers import UvicornWorker
+
+
+class EVTrackUvicornWorker(UvicornWorker):
+    # Pin the fast event loop and HTTP parser instead of relying on "auto", and
+    # skip the Server header on every response
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "server_header": False}
+
+
+bind = os.getenv("BIND", "0.0.0.0:3000")
+
+# One worker by default: each runs DRIVER_POOL_SIZE browsers, so browsers per host = workers x pool size
+workers = int(os.getenv("WEB_CONCURRENCY", "1"))
+worker_class = EVTrackUvicornWorker
+
+# Browser automation requests routinely take tens of seconds
+timeout = int(os.getenv("WORKER_TIMEOUT", "900"))
+graceful_timeout = 30
@@ -0,0 +1,178 @@
+"""
+Pool of warm Selenium WebDriver instances shared across API requests
+
+Starting Chrome costs anywhere from a few hundred milliseconds to several
+seconds, which used to dominate every EVTrack operation. The pool keeps idle
+drivers around and hands them back out instead of launching a new browser
+per request. Drivers left idle longer than the optional TTL are quit so a
+quiet host doesn't keep browsers running indefinitely.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPoolTimeout(TimeoutError):
+    """Raised when no driver frees up within the pool's acquire timeout"""
+
+
+class DriverPool:
+    def __init__(self, factory, size, acquire_timeout=None, idle_ttl=None):
+        """
+        Args:
+            factory (callable): Zero-argument function that starts a new WebDriver
+            size (int): Maximum number of drivers checked out at once
+            acquire_timeout (float): Seconds a caller may wait for a free driver (None waits forever)
+            idle_ttl (float): Seconds a driver may sit idle before reap_idle() quits it (None keeps it)
+        """
+        self.factory = factory
+        self.size = size
+        self.acquire_timeout = acquire_timeout
+        self.idle_ttl = idle_ttl
+        self.in_use = 0
+        self.waiting = 0
+        # (driver, time.monotonic() when it went idle)
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+
+    async def acquire(self):
+        """
+        Check out a driver, reusing an idle one when available
+
+        Waits while all `size` drivers are in use, so excess requests queue here
+        instead of starting more browsers than the host can run. Chrome startup
+        runs in a worker thread so the event loop keeps serving other requests.
+
+        Returns:
+            WebDriver: Driver reserved for the caller until release()
+
+        Raises:
+            DriverPoolTimeout: No driver became free within acquire_timeout
+        """
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise DriverPoolTimeout(f"No browser became free within {self.acquire_timeout:g}s") from None
+        finally:
+            self.waiting -= 1
+        try:
+            while self._idle:
+                driver, _ = self._idle.pop()
+                if await asyncio.to_thread(self._is_alive, driver):
+                    break
+                await asyncio.to_thread(self._quit, driver)
+            else:
+                driver = await asyncio.to_thread(self.factory)
+        except BaseException:
+            self._slots.release()
+            raise
+        self.in_use += 1
+        return driver
+
+    async def release(self, driver):
+        """
+        Return a driver to the pool
+
+        The browser is parked on a blank page but keeps its cookies, so the
+        next request can reuse the EVTrack session instead of logging in
+        again. Drivers that fail the reset are quit instead of being reused.
+        Both go through a worker thread since WebDriver calls block.
+        """
+        try:
+            await asyncio.to_thread(driver.get, 'about:blank')
+            self._idle.append((driver, time.monotonic()))
+        except Exception as e:
+            logger.warning(f"Discarding broken driver: {str(e)}")
+            await asyncio.to_thread(self._quit, driver)
+        finally:
+            self.in_use -= 1
+            self._slots.release()
+
+    async def discard(self, driver):
+        """
+        Quit a checked-out driver instead of returning it, freeing its slot
+        
+        For drivers that may still be busy (e.g. a timed-out operation's thread is
+        still running on them), where resetting them for reuse isn't safe.
+        """
+        try:
+            await asyncio.to_thread(self._quit, driver)
+        finally:
+            self.in_use -= 1
+            self._slots.release()
+
+    @asynccontextmanager
+    async def checkout(self):
+        """
+        Check out a driver for the duration of an `async with` block
+
+        The driver goes back to the pool however the block exits.
+        """
+        driver = await self.acquire()
+        try:
+            yield driver
+        finally:
+            await self.release(driver)
+
+    async def prewarm(self, count=None, setup=None):
+        """
+        Start up to `count` drivers ahead of the first request (defaults to the pool size)
+
+        Args:
+            count (int): Number of idle drivers to have ready
+            setup (callable): Optional coroutine function run on each new driver (e.g. login);
+                a driver whose setup fails is still kept, the next request just redoes it
+        """
+        count = self.size if count is None else min(count, self.size)
+        while len(self._idle) < count:
+            try:
+                driver = await asyncio.to_thread(self.factory)
+            except Exception as e:
+                logger.error(f"Failed to prewarm driver: {str(e)}")
+                break
+            if setup:
+                try:
+                    await setup(driver)
+                except Exception as e:
+                    logger.warning(f"Prewarm setup failed: {str(e)}")
+            self._idle.append((driver, time.monotonic()))
+        logger.info(f"Driver pool prewarmed with {len(self._idle)} driver(s)")
+
+    async def reap_idle(self):
+        """Quit drivers idle for longer than idle_ttl; checkouts start new ones as needed"""
+        if self.idle_ttl is None:
+            return
+        cutoff = time.monotonic() - self.idle_ttl
+        stale = [driver for driver, idle_since in self._idle if idle_since < cutoff]
+        if not stale:
+            return
+        self._idle = [(driver, idle_since) for driver, idle_since in self._idle if idle_since >= cutoff]
+        logger.info(f"Quitting {len(stale)} idle driver(s)")
+        for driver in stale:
+            await asyncio.to_thread(self._quit, driver)
+
+    def close(self):
+        """Quit every idle driver"""
+        while self._idle:
+            self._quit(self._idle.pop()[0])
+
+    @staticmethod
+    def _is_alive(driver):
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+            logger.info("Browser closed")
+        except Exception as e:
+            logger.error(f"Error closing browser: {str(e)}")
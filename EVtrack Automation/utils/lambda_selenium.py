@@ -5,10 +5,9 @@ Uses chrome-aws-lambda layer for headless browser support
 
 import os
 import tempfile
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
+# Detect once whether we're running in Lambda; the environment doesn't change per invocation
+IS_LAMBDA = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
 
 
 def start_driver_lambda(headless=True):
@@ -22,10 +21,12 @@ def start_driver_lambda(headless=True):
         webdriver.Chrome: Configured Chrome WebDriver instance
     """
     
-    # Detect if we're running in Lambda
-    is_lambda = os.environ.get('AWS_LAMBDA_FUNCTION_NAME') is not None
-    
-    if is_lambda:
+    if IS_LAMBDA:
+        # Imported on first use so importing IS_LAMBDA doesn't load Selenium
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        
         # Lambda environment configuration
         chrome_options = Options()
         chrome_options.binary_location = '/opt/chrome/chrome'
@@ -60,8 +61,9 @@ def start_driver_lambda(headless=True):
         driver = start_driver(headless=headless)
     
     # Set timeouts
+    from utils.selenium_utils import IMPLICIT_WAIT
     driver.set_page_load_timeout(60)
-    driver.implicitly_wait(10)
+    driver.implicitly_wait(IMPLICIT_WAIT)
     
     return driver
 
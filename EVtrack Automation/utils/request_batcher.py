@@ -0,0 +1,138 @@
+"""
+Micro-batching of browser operations that arrive close together
+
+Bulk callers such as Google Apps Script post visitors and credentials one at
+a time. Instead of checking out a driver and logging in for each of them, the
+batcher collects operations for a short window and runs the whole batch
+sequentially in one logged-in browser session. Batches run concurrently,
+one per pooled driver, so a slow batch doesn't hold up the next one.
+"""
+
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RequestBatcher:
+    def __init__(self, driver_pool, setup, max_batch=16, max_wait_ms=50, operation_timeout=None):
+        """
+        Args:
+            driver_pool (DriverPool): Pool the batch driver is checked out from
+            setup (callable): Coroutine function run once per batch with the driver (e.g. login)
+            max_batch (int): Maximum number of operations run in one session
+            max_wait_ms (int): How long to wait for more operations after the first one arrives
+            operation_timeout (float): Seconds the setup or a single operation may run (None waits forever)
+        """
+        self.driver_pool = driver_pool
+        self.setup = setup
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.operation_timeout = operation_timeout
+        self._queue = None
+        self._worker = None
+        # Running batch tasks, referenced so they aren't garbage collected mid-run
+        self._batches = set()
+
+    async def submit(self, operation):
+        """
+        Queue an operation and wait for its result
+
+        Args:
+            operation (callable): Coroutine function taking the batch driver
+
+        Returns:
+            Whatever the operation returns; exceptions it raises are re-raised here
+        """
+        if self._worker is None or self._worker.done():
+            # Started lazily so it binds to the running loop (Lambda skips startup events)
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _next_batch(self):
+        batch = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            # Waiting for a driver here caps the running batches at the pool size; operations
+            # queued meanwhile go into the next batch
+            try:
+                driver = await self.driver_pool.acquire()
+            except Exception as e:
+                logger.error(f"Batch failed: {str(e)}")
+                self._fail(batch, e)
+                continue
+            task = asyncio.create_task(self._run_batch(batch, driver))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    async def _run_batch(self, batch, driver):
+        logger.info(f"Running batch of {len(batch)} operation(s)")
+        # A timed-out or cancelled operation's Selenium thread may still be driving the
+        # browser, so quitting it is the only safe way to get the slot back
+        discard = False
+        try:
+            try:
+                async with asyncio.timeout(self.operation_timeout) as deadline:
+                    await self.setup(driver)
+            except Exception as e:
+                if deadline.expired():
+                    discard = True
+                    e = TimeoutError(f"Login didn't finish within {self.operation_timeout:g}s")
+                logger.error(f"Batch failed: {str(e)}")
+                self._fail(batch, e)
+                return
+            
+            for position, (operation, future) in enumerate(batch):
+                if future.cancelled():
+                    continue
+                try:
+                    async with asyncio.timeout(self.operation_timeout) as deadline:
+                        result = await operation(driver)
+                except Exception as e:
+                    if deadline.expired():
+                        # Only the stuck operation fails; the rest go back on the queue for another driver
+                        discard = True
+                        logger.error(f"Operation timed out after {self.operation_timeout:g}s")
+                        if not future.done():
+                            future.set_exception(TimeoutError(f"Browser operation didn't finish within {self.operation_timeout:g}s"))
+                        for item in batch[position + 1:]:
+                            if not item[1].done():
+                                self._queue.put_nowait(item)
+                        return
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+        except asyncio.CancelledError:
+            discard = True
+            for _, future in batch:
+                future.cancel()
+            raise
+        finally:
+            if discard:
+                await self.driver_pool.discard(driver)
+            else:
+                await self.driver_pool.release(driver)
+
+    @staticmethod
+    def _fail(batch, error):
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
@@ -1,8 +1,12 @@
 import logging
+import os
 import time
+import weakref
+from contextlib import contextmanager
 from selenium import webdriver
+from selenium.webdriver.remote.file_detector import LocalFileDetector
 from selenium.webdriver.chrome.service import Service
-from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException
+from selenium.common.exceptions import WebDriverException, TimeoutException, NoSuchElementException, StaleElementReferenceException
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -12,6 +16,16 @@ from selenium.webdriver.chrome.options import Options
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Seconds between condition checks in explicit waits (Selenium defaults to 0.5)
+WAIT_POLL_FREQUENCY = 0.25
+
+# Seconds a bare find_element keeps retrying a missing element. Explicit waits run with
+# it switched off (no_implicit_wait), otherwise every failed poll would block this long
+IMPLICIT_WAIT = 5
+
+# Nesting depth of no_implicit_wait blocks per driver, so inner blocks don't restore early
+_implicit_wait_depth = weakref.WeakKeyDictionary()
+
 def start_driver(headless=True):
     try:
         chrome_options = Options()
@@ -69,13 +83,25 @@ def start_driver(headless=True):
         
         logger.info("Added AGGRESSIVE Chrome options to COMPLETELY prevent any downloads")
         
-        logger.info("Setting up Chrome driver")
-        # Use webdriver_manager to handle ChromeDriver
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        remote_url = os.getenv("SELENIUM_REMOTE_URL")
+        if remote_url:
+            # Browsers live on a Selenium Grid / standalone node instead of this host
+            logger.info(f"Connecting to remote Chrome at {remote_url}")
+            # keep_alive reuses one HTTP connection to the node for every WebDriver command.
+            # The urllib3 pool keeps its default size: each pooled driver owns its own
+            # RemoteConnection and only one request holds a driver at a time, so its
+            # commands never run concurrently and a larger pool would sit idle
+            driver = webdriver.Remote(command_executor=remote_url, options=chrome_options, keep_alive=True)
+            # Upload paths are local to the API host; ship the files to the node on send_keys
+            driver.file_detector = LocalFileDetector()
+        else:
+            logger.info("Setting up Chrome driver")
+            # Use webdriver_manager to handle ChromeDriver
+            service = Service(ChromeDriverManager().install())
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         
-        # Increase timeouts for better reliability
-        driver.implicitly_wait(20)  # Increased from 10
+        # Increase timeouts for better reliability; the implicit wait stays short (see IMPLICIT_WAIT)
+        driver.implicitly_wait(IMPLICIT_WAIT)
         driver.set_page_load_timeout(60)  # Increased from 30
         driver.set_script_timeout(60)  # Increased from 30
         
@@ -88,12 +114,28 @@ def start_driver(headless=True):
         logger.error(f"Unexpected error: {str(e)}")
         raise
 
+@contextmanager
+def no_implicit_wait(driver):
+    """Switch the driver's implicit wait off for the block so explicit waits and probes time out when they say"""
+    depth = _implicit_wait_depth.get(driver, 0)
+    if not depth:
+        driver.implicitly_wait(0)
+    _implicit_wait_depth[driver] = depth + 1
+    try:
+        yield
+    finally:
+        _implicit_wait_depth[driver] = depth
+        if not depth:
+            driver.implicitly_wait(IMPLICIT_WAIT)
+
 def wait_for_element(driver, by, value, timeout=20):
     logger.info(f"Waiting for element: {by}={value} (timeout: {timeout}s)")
     try:
-        element = WebDriverWait(driver, timeout).until(
-            EC.presence_of_element_located((by, value))
-        )
+        with no_implicit_wait(driver):
+            element = WebDriverWait(driver, timeout, poll_frequency=WAIT_POLL_FREQUENCY,
+                                    ignored_exceptions=(StaleElementReferenceException,)).until(
+                EC.presence_of_element_located((by, value))
+            )
         logger.info(f"Element found: {by}={value}")
         return element
     except Exception as e:
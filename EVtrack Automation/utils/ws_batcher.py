@@ -0,0 +1,68 @@
+"""
+Batched WebSocket sender for automation progress updates
+
+The automation classes report progress with many tiny messages. Sending each
+one as its own frame wastes framing overhead and event-loop wakeups, so this
+sender collects the messages produced within a short window and flushes them
+as a single JSON array frame. A burst that fills a batch is flushed right away
+instead of waiting out the window.
+"""
+
+import asyncio
+import logging
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class BatchedWSSender:
+    def __init__(self, websocket, interval=0.05, max_batch=50):
+        """
+        Args:
+            websocket (WebSocket): Accepted connection to send batches on
+            interval (float): Seconds to collect messages before flushing
+            max_batch (int): Number of queued messages that triggers an immediate flush
+        """
+        self.websocket = websocket
+        self.interval = interval
+        self.max_batch = max_batch
+        self._pending = []
+        self._flusher = None
+        self._full = asyncio.Event()
+        # Automation code reports progress from Selenium worker threads; batches are
+        # always assembled and sent on the loop that owns the websocket
+        self._loop = asyncio.get_running_loop()
+
+    def enqueue(self, message):
+        """Queue a message for the next batch, scheduling a flush if none is pending (loop thread only)"""
+        self._pending.append(message)
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        if self._flusher is None or self._flusher.done():
+            self._flusher = self._loop.create_task(self._flush_later())
+
+    async def send_json(self, message):
+        """Drop-in for WebSocket.send_json so automation classes can use the sender unchanged; safe from any thread"""
+        self._loop.call_soon_threadsafe(self.enqueue, message)
+
+    async def _flush_later(self):
+        # Keep flushing while messages arrive during a send, otherwise they'd wait for the next enqueue
+        while self._pending:
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            batch, self._pending = self._pending, []
+            try:
+                # Text frames, so existing clients that JSON.parse the message keep working
+                await self.websocket.send_text(orjson.dumps(batch).decode())
+            except Exception as e:
+                logger.warning(f"Dropped {len(batch)} progress update(s): {str(e)}")
+
+    def close(self):
+        """Cancel any pending flush; queued messages are discarded"""
+        if self._flusher and not self._flusher.done():
+            self._flusher.cancel()
+        self._pending = []